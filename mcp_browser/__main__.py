@@ -11,10 +11,12 @@ import json
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-from .proxy import MCPBrowser
+from .proxy import MCPBrowser, install_uvloop
 from .config import ConfigLoader
 from .daemon import MCPBrowserDaemon, MCPBrowserClient, get_socket_path, is_daemon_running, kill_daemon_with_children
 from .logging_config import setup_logging, get_logger
+from ._json import loads
+from ._stdio import stdin_lines, write_message
 
 
 def build_mcp_request(args) -> Dict[str, Any]:
@@ -462,22 +464,17 @@ async def run_server_mode(browser: MCPBrowser):
     # This prevents timeout issues when the browser tries to connect to upstream servers
     
     # Read JSON-RPC from stdin line by line
-    while True:
-        try:
-            line = sys.stdin.readline()
-            if not line:  # EOF
-                break
-                
+    try:
+        async for line in stdin_lines():
             line = line.strip()
             if not line:  # Empty line
                 continue
                 
             try:
-                request = json.loads(line)
+                request = loads(line)
                 response = await browser.call(request)
-                print(json.dumps(response))
-                sys.stdout.flush()
-            except json.JSONDecodeError as e:
+                write_message(response)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
                 # Send error response for malformed JSON
                 error_response = {
                     "jsonrpc": "2.0",
@@ -488,13 +485,10 @@ async def run_server_mode(browser: MCPBrowser):
                         "data": str(e)
                     }
                 }
-                print(json.dumps(error_response))
-                sys.stdout.flush()
+                write_message(error_response)
                 
-        except KeyboardInterrupt:
-            break
-        except EOFError:
-            break
+    except KeyboardInterrupt:
+        pass
 
 
 async def run_server_mode_with_daemon(socket_path: Path):
@@ -503,22 +497,17 @@ async def run_server_mode_with_daemon(socket_path: Path):
     
     async with MCPBrowserClient(socket_path) as client:
         # Read JSON-RPC from stdin line by line, forward to daemon
-        while True:
-            try:
-                line = sys.stdin.readline()
-                if not line:  # EOF
-                    break
-                    
+        try:
+            async for line in stdin_lines():
                 line = line.strip()
                 if not line:  # Empty line
                     continue
                     
                 try:
-                    request = json.loads(line)
+                    request = loads(line)
                     response = await client.call(request)
-                    print(json.dumps(response))
-                    sys.stdout.flush()
-                except json.JSONDecodeError as e:
+                    write_message(response)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
                     # Send error response for malformed JSON
                     error_response = {
                         "jsonrpc": "2.0",
@@ -529,13 +518,10 @@ async def run_server_mode_with_daemon(socket_path: Path):
                             "data": str(e)
                         }
                     }
-                    print(json.dumps(error_response))
-                    sys.stdout.flush()
+                    write_message(error_response)
                             
-            except KeyboardInterrupt:
-                break
-            except EOFError:
-                break
+        except KeyboardInterrupt:
+            pass
 
 
 async def interactive_mode_with_daemon(socket_path: Path):
@@ -616,6 +602,9 @@ def main():
         use_syslog=use_syslog
     )
     
+    # Use uvloop for faster stdio/socket I/O when available
+    install_uvloop()
+    
     # Import version
     from . import __version__
     
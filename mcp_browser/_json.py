@@ -0,0 +1,58 @@
+"""
+JSON encoding and decoding for the request hot path.
+
+Uses orjson when it is installed (pip install mcp-browser[fast]) and falls
+back to the standard library otherwise. Both produce equivalent JSON; only
+insignificant whitespace differs.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from str or UTF-8 bytes."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity and ints beyond 64 bits; json accepts those and
+            # raises the usual JSONDecodeError for really malformed input
+            pass
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # Non-str keys, oversized ints, etc.; let json handle or reject them
+            pass
+    return json.dumps(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes, ready for a stream write."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode()
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Serialize obj to a JSON string indented by two spaces."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2)
@@ -0,0 +1,57 @@
+"""
+Stdio transport for the front ends.
+
+Reading sys.stdin directly inside a coroutine blocks the whole event loop
+until a line arrives, stalling server readers, timers and background
+refreshes; stdin_lines() reads through the loop instead. write_message()
+emits replies as bytes, bypassing the text layer of sys.stdout.
+"""
+
+import asyncio
+import os
+import stat
+import sys
+from typing import Any, AsyncIterator
+
+from ._json import dumps_bytes
+
+# Longest line accepted on stdin; tool call arguments can be large
+STDIN_LIMIT = 16 * 1024 * 1024
+
+
+async def stdin_lines() -> AsyncIterator[bytes]:
+    """Yield raw stdin lines until EOF without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=STDIN_LIMIT)
+
+    try:
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+        pollable = stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+        if pollable:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except (ValueError, NotImplementedError, OSError):
+        pollable = False
+
+    if not pollable:
+        # Files, /dev/null, terminals and Windows consoles cannot be (reliably)
+        # watched by the loop; read them in a worker thread instead
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
+            if not line:
+                return
+            yield line
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        yield line
+
+
+def write_message(message: Any):
+    """Write one JSON-RPC message to stdout as a newline-terminated line."""
+    # Anything print()ed earlier must go out first
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    out.write(dumps_bytes(message) + b"\n")
+    out.flush()
@@ -5,52 +5,79 @@ Handles partial JSON messages and ensures atomic delivery of complete
 JSON-RPC messages, critical for reliable MCP communication.
 """
 
-import json
-from typing import List, Optional
+from typing import AnyStr, List, Optional
+
+from ._json import loads
 
 
 class JsonRpcBuffer:
     """Buffer for accumulating and extracting complete JSON-RPC messages."""
     
     def __init__(self):
-        self.buffer = ""
+        # Pieces of the current incomplete line, joined once it completes
+        self._partial: List[AnyStr] = []
     
-    def append(self, data: str) -> List[dict]:
+    def append(self, data: AnyStr) -> List[dict]:
         """
         Append data to buffer and extract complete JSON-RPC messages.
         
+        Only the new data is scanned for line breaks; previously buffered
+        text is joined just once, when its line is finally terminated.
+        
         Args:
-            data: Raw string data to append
+            data: Raw str, or UTF-8 bytes straight from a pipe (parsed
+                without a separate decode step); use one type per buffer
             
         Returns:
-            List of complete JSON-RPC message dictionaries
+            List of complete JSON-RPC message dictionaries; batch arrays
+            are flattened into their individual messages
         """
-        self.buffer += data
-        messages = []
+        newline = '\n' if isinstance(data, str) else b'\n'
+        end = data.rfind(newline)
+        if end < 0:
+            # No complete line yet
+            if data:
+                self._partial.append(data)
+            return []
         
-        # Extract complete JSON messages line by line
-        lines = self.buffer.split('\n')
+        # Everything up to the last newline is complete
+        if self._partial:
+            self._partial.append(data[:end])
+            block = data[:0].join(self._partial)
+            self._partial = []
+        else:
+            block = data[:end]
         
-        # Keep the last incomplete line in the buffer
-        self.buffer = lines[-1]
+        # Keep the trailing incomplete line in the buffer
+        if end + 1 < len(data):
+            self._partial.append(data[end + 1:])
+        
+        messages = []
         
         # Process complete lines
-        for line in lines[:-1]:
+        for line in block.split(newline):
             line = line.strip()
             if not line:
                 continue
                 
             try:
-                msg = json.loads(line)
+                msg = loads(line)
                 # Validate it's a proper JSON-RPC message
-                if isinstance(msg, dict) and ('jsonrpc' in msg or 'method' in msg or 'id' in msg):
-                    messages.append(msg)
-            except json.JSONDecodeError:
-                # Log or handle malformed JSON
+                if isinstance(msg, dict):
+                    if 'jsonrpc' in msg or 'method' in msg or 'id' in msg:
+                        messages.append(msg)
+                elif isinstance(msg, list):
+                    # JSON-RPC batch: unpack the responses in order
+                    messages.extend(
+                        m for m in msg
+                        if isinstance(m, dict) and ('jsonrpc' in m or 'method' in m or 'id' in m)
+                    )
+            except ValueError:
+                # Malformed JSON, or bytes that are not valid UTF-8
                 pass
         
         return messages
     
     def clear(self):
         """Clear the buffer."""
-        self.buffer = ""
\ No newline at end of file
+        self._partial = []
@@ -18,9 +18,11 @@ import time
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-from .proxy import MCPBrowser
+from .proxy import MCPBrowser, install_uvloop
 from .daemon import MCPBrowserClient, get_socket_path, is_daemon_running
 from .logging_config import setup_logging, get_logger
+from ._json import loads
+from ._stdio import stdin_lines, write_message
 
 
 def start_daemon_if_needed(server_name: Optional[str] = None, timeout: float = 5.0) -> bool:
@@ -70,30 +72,20 @@ async def run_mcp_server_mode(args):
         logger.info(f"Using daemon at {socket_path}")
         async with MCPBrowserClient(socket_path) as client:
             # Forward stdin/stdout to daemon
-            buffer = ""
-            while True:
-                try:
-                    chunk = sys.stdin.read(4096)
-                    if not chunk:
-                        break
-                    
-                    buffer += chunk
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        if line.strip():
-                            try:
-                                request = json.loads(line)
-                                response = await client.call(request)
-                                print(json.dumps(response), flush=True)
-                            except json.JSONDecodeError:
-                                pass
-                            except Exception as e:
-                                logger.error(f"Error forwarding to daemon: {e}")
-                                
-                except KeyboardInterrupt:
-                    break
-                except EOFError:
-                    break
+            try:
+                async for line in stdin_lines():
+                    if line.strip():
+                        try:
+                            request = loads(line)
+                            response = await client.call(request)
+                            write_message(response)
+                        except (json.JSONDecodeError, UnicodeDecodeError):
+                            pass
+                        except Exception as e:
+                            logger.error(f"Error forwarding to daemon: {e}")
+                            
+            except KeyboardInterrupt:
+                pass
     else:
         # Run standalone
         logger.info("Running in standalone mode")
@@ -106,28 +98,17 @@ async def run_mcp_server_mode(args):
         await browser.initialize()
         
         try:
-            buffer = ""
-            while True:
-                try:
-                    chunk = sys.stdin.read(4096)
-                    if not chunk:
-                        break
+            async for line in stdin_lines():
+                if line.strip():
+                    try:
+                        request = loads(line)
+                        response = await browser.call(request)
+                        write_message(response)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        pass
                         
-                    buffer += chunk
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        if line.strip():
-                            try:
-                                request = json.loads(line)
-                                response = await browser.call(request)
-                                print(json.dumps(response), flush=True)
-                            except json.JSONDecodeError:
-                                pass
-                                
-                except KeyboardInterrupt:
-                    break
-                except EOFError:
-                    break
+        except KeyboardInterrupt:
+            pass
         finally:
             await browser.close()
 
@@ -283,6 +264,9 @@ def main():
         use_syslog=use_syslog
     )
     
+    # Use uvloop for faster stdio/socket I/O when available
+    install_uvloop()
+    
     # Log startup message
     logger = get_logger(__name__)
     if args.mode == "server":
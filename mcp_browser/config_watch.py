@@ -0,0 +1,136 @@
+"""
+Shared config file watching.
+
+All MCPBrowser instances on an event loop register their config files with
+one hub, which runs a single task for all of them: watchfiles events when
+watchfiles is installed, otherwise one mtime poll per file every 2 seconds.
+"""
+
+import asyncio
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .logging_config import get_logger
+
+try:
+    from watchfiles import awatch
+except ImportError:
+    awatch = None
+
+
+# Seconds between mtime checks when polling
+POLL_INTERVAL = 2.0
+
+# Called with the file's new mtime
+ChangeCallback = Callable[[float], None]
+
+
+class _ConfigWatchHub:
+    """Watches a set of files on one event loop with a single task."""
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._callbacks: Dict[Path, List[ChangeCallback]] = {}
+        self._mtimes: Dict[Path, Optional[float]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Set to make the event watcher restart with the current file set
+        self._restart: Optional[asyncio.Event] = None
+
+    def register(self, path: Path, callback: ChangeCallback):
+        """Call callback(mtime) whenever the file at path changes."""
+        path = path.resolve()
+        callbacks = self._callbacks.get(path)
+        if callbacks is None:
+            callbacks = self._callbacks[path] = []
+            self._mtimes[path] = self._stat(path)
+            if self._restart is not None:
+                self._restart.set()
+        callbacks.append(callback)
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def unregister(self, path: Path, callback: ChangeCallback):
+        """Stop calling callback for path; the task ends with the last file."""
+        path = path.resolve()
+        callbacks = self._callbacks.get(path)
+        if not callbacks or callback not in callbacks:
+            return
+
+        callbacks.remove(callback)
+        if not callbacks:
+            del self._callbacks[path]
+            del self._mtimes[path]
+            if self._restart is not None:
+                self._restart.set()
+
+        if not self._callbacks and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[float]:
+        """Return the file's mtime, or None if it does not exist."""
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
+
+    def _check(self, path: Path):
+        """Notify callbacks for path if its mtime changed."""
+        mtime = self._stat(path)
+        if mtime is None or mtime == self._mtimes.get(path):
+            return
+        self._mtimes[path] = mtime
+
+        for callback in list(self._callbacks.get(path, ())):
+            try:
+                callback(mtime)
+            except Exception as e:
+                self.logger.error(f"Config change handler error: {e}")
+
+    async def _run(self):
+        """Service every registered file until cancelled."""
+        try:
+            if awatch is not None:
+                try:
+                    await self._watch_events()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Config watcher error: {e}, falling back to polling")
+            await self._poll()
+        except asyncio.CancelledError:
+            pass
+
+    async def _watch_events(self):
+        """Wait for OS file notifications on the watched files' directories."""
+        while self._callbacks:
+            self._restart = asyncio.Event()
+            # Watch directories so editors that replace the file are seen
+            dirs = {path.parent for path in self._callbacks}
+            async for changes in awatch(*dirs, stop_event=self._restart):
+                changed = {Path(p).resolve() for _, p in changes}
+                for path in changed.intersection(self._callbacks):
+                    self._check(path)
+
+    async def _poll(self):
+        """Check each watched file's mtime every POLL_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            for path in list(self._callbacks):
+                self._check(path)
+
+
+# One hub per event loop
+_hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ConfigWatchHub]" = weakref.WeakKeyDictionary()
+
+
+def get_watch_hub() -> _ConfigWatchHub:
+    """Return the config watch hub for the running event loop."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = _ConfigWatchHub()
+    return hub
@@ -8,8 +8,9 @@ allowing shared state and better performance.
 import os
 import json
 import asyncio
+import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import signal
 import sys
 
@@ -26,6 +27,7 @@ except ImportError:
             except OSError:
                 return False
 
+from ._json import loads, dumps_bytes
 from .proxy import MCPBrowser
 from .logging_config import get_logger
 
@@ -94,18 +96,27 @@ class MCPBrowserDaemon:
         self._clients.add(writer)
         
         try:
-            buffer = ""
+            # Chunks of the current incomplete line; only new data is scanned
+            # for newlines and a line is joined once, when it completes
+            partial: List[bytes] = []
             while self._running:
                 # Read data from client
-                data = await reader.read(4096)
+                data = await reader.read(65536)
                 if not data:
                     break
                 
-                buffer += data.decode('utf-8')
+                end = data.rfind(b'\n')
+                if end < 0:
+                    partial.append(data)
+                    continue
                 
-                # Process complete JSON objects
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
+                partial.append(data[:end])
+                block = b''.join(partial)
+                partial = [data[end + 1:]] if end + 1 < len(data) else []
+                
+                # Process complete JSON objects; lines are parsed as whole
+                # UTF-8 bytes, so characters split across reads stay intact
+                for line in block.split(b'\n'):
                     if line.strip():
                         await self._process_request(line, writer)
                         
@@ -119,27 +130,30 @@ class MCPBrowserDaemon:
             await writer.wait_closed()
             self.logger.debug(f"Client disconnected: {client_addr}")
     
-    async def _process_request(self, line: str, writer: asyncio.StreamWriter):
-        """Process a JSON-RPC request from client."""
+    async def _process_request(self, line: bytes, writer: asyncio.StreamWriter):
+        """Process a JSON-RPC request line from client."""
         try:
-            request = json.loads(line)
+            request = loads(line)
             
-            # Add debug output if configured
-            if self.browser.config and self.browser.config.debug:
-                self.logger.debug(f"Daemon received: {json.dumps(request)}")
+            # Add debug output if configured; the raw line is logged as-is
+            # rather than re-serializing the parsed request
+            debug_on = (self.browser.config and self.browser.config.debug
+                        and self.logger.isEnabledFor(logging.DEBUG))
+            if debug_on:
+                self.logger.debug("Daemon received: %s", line.decode('utf-8', 'replace').strip())
             
             # Forward to browser
             response = await self.browser.call(request)
             
             # Send response back to client
-            response_str = json.dumps(response) + '\n'
-            writer.write(response_str.encode('utf-8'))
+            response_data = dumps_bytes(response) + b'\n'
+            writer.write(response_data)
             await writer.drain()
             
-            if self.browser.config and self.browser.config.debug:
-                self.logger.debug(f"Daemon sent: {response_str.strip()}")
+            if debug_on:
+                self.logger.debug("Daemon sent: %s", response_data.decode().strip())
                 
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             error_response = {
                 "jsonrpc": "2.0",
                 "id": None,
@@ -148,7 +162,7 @@ class MCPBrowserDaemon:
                     "message": f"Parse error: {e}"
                 }
             }
-            writer.write((json.dumps(error_response) + '\n').encode('utf-8'))
+            writer.write(dumps_bytes(error_response) + b'\n')
             await writer.drain()
         except Exception as e:
             error_response = {
@@ -159,7 +173,7 @@ class MCPBrowserDaemon:
                     "message": f"Internal error: {e}"
                 }
             }
-            writer.write((json.dumps(error_response) + '\n').encode('utf-8'))
+            writer.write(dumps_bytes(error_response) + b'\n')
             await writer.drain()
     
     async def stop(self):
@@ -223,8 +237,7 @@ class MCPBrowserClient:
             await self.connect()
         
         # Send request
-        request_str = json.dumps(request) + '\n'
-        self.writer.write(request_str.encode('utf-8'))
+        self.writer.write(dumps_bytes(request) + b'\n')
         await self.writer.drain()
         
         # Read response
@@ -232,7 +245,7 @@ class MCPBrowserClient:
         if not response_line:
             raise ConnectionError("Connection closed by daemon")
         
-        return json.loads(response_line.decode('utf-8'))
+        return loads(response_line)
     
     async def close(self):
         """Close the connection."""
@@ -13,7 +13,7 @@ import signal
 from pathlib import Path
 from typing import Optional
 
-from .proxy import MCPBrowser
+from .proxy import MCPBrowser, install_uvloop
 from .daemon import MCPBrowserDaemon, get_socket_path
 from .logging_config import setup_logging, get_logger
 
@@ -140,7 +140,8 @@ def main():
         devnull_in.close()
         devnull_out.close()
     
-    # Run the daemon
+    # Run the daemon (on uvloop when available)
+    install_uvloop()
     asyncio.run(run_daemon(args))
 
 
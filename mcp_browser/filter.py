@@ -7,10 +7,17 @@ sparse mode and virtual tool injection.
 
 import sys
 import json
-from typing import Dict, Any, Optional, List, Callable, Union
+from typing import Dict, Any, Optional, List, Callable, Union, Awaitable
 from .registry import ToolRegistry
 
 
+# Names of the meta-tools returned by ToolRegistry.get_sparse_tools()
+VIRTUAL_TOOLS = frozenset(("mcp_discover", "mcp_call", "onboarding"))
+
+# Stand-in for missing params/arguments; only ever read, never modified
+_EMPTY: Dict[str, Any] = {}
+
+
 class MessageFilter:
     """Filter and transform JSON-RPC messages to always show sparse tools."""
     
@@ -56,6 +63,39 @@ class MessageFilter:
         
         return message
     
+    def filter_incoming_inplace(self, message: dict) -> bool:
+        """
+        Filter a message coming from the server by modifying it in place.
+        
+        Same rules as filter_incoming(), but tools/list responses are
+        rewritten without copying the message. Only use this for messages
+        the caller owns. The result object may be shared with another
+        consumer of the reply, so it is replaced by a new one rather than
+        changed, and the full tool list in it stays intact.
+        
+        Args:
+            message: Incoming JSON-RPC message
+            
+        Returns:
+            False if the message should be blocked, True otherwise
+        """
+        msg_id = message.get("id")
+        if msg_id is None:
+            return True
+        
+        result = message.get("result")
+        if isinstance(result, dict):
+            tools = result.get("tools")
+            if tools:
+                self.registry.update_tools(tools)
+                message["result"] = {**result, "tools": self.registry.get_sparse_tools()}
+        elif (msg_id in self._handled_ids and
+              message.get("error", {}).get("code") == -32603):
+            self._handled_ids.discard(msg_id)
+            return False
+        
+        return True
+    
     def _filter_tools_response(self, message: dict) -> dict:
         """Apply sparse mode filtering to tools/list response."""
         tools = message["result"]["tools"]
@@ -77,7 +117,7 @@ class MessageFilter:
     
     def is_virtual_tool(self, tool_name: str) -> bool:
         """Check if a tool is virtual (handled locally)."""
-        return tool_name in ["mcp_discover", "mcp_call", "onboarding"]
+        return tool_name in VIRTUAL_TOOLS
 
 
 class VirtualToolHandler:
@@ -86,6 +126,11 @@ class VirtualToolHandler:
     def __init__(self, registry: ToolRegistry, server_callback: Callable):
         self.registry = registry
         self.server_callback = server_callback
+        # Tool name -> coroutine taking the tools/call message
+        self.dispatch: Dict[str, Callable[[dict], Awaitable[dict]]] = {
+            "mcp_discover": self._handle_discover,
+            "mcp_call": self._handle_call,
+        }
         
     async def handle_tool_call(self, message: dict) -> Optional[dict]:
         """
@@ -100,21 +145,18 @@ class VirtualToolHandler:
         if message.get("method") != "tools/call":
             return None
             
-        tool_name = message.get("params", {}).get("name")
-        
-        if tool_name == "mcp_discover":
-            return await self._handle_discover(message)
-        elif tool_name == "mcp_call":
-            return await self._handle_call(message)
-        elif tool_name == "onboarding":
-            # Onboarding is handled specially in the proxy
-            return None
+        tool_name = (message.get("params") or _EMPTY).get("name")
+        
+        # Onboarding is not listed here; it is handled specially in the proxy
+        handler = self.dispatch.get(tool_name)
+        if handler:
+            return await handler(message)
         
         return None
     
     async def _handle_discover(self, message: dict) -> dict:
         """Handle mcp_discover tool call."""
-        params = message.get("params", {}).get("arguments", {})
+        params = (message.get("params") or _EMPTY).get("arguments") or _EMPTY
         jsonpath = params.get("jsonpath", "$.tools[*]")
         
         try:
@@ -142,7 +184,7 @@ class VirtualToolHandler:
     
     async def _handle_call(self, message: dict) -> dict:
         """Handle mcp_call tool - forward transformed request."""
-        params = message.get("params", {}).get("arguments", {})
+        params = (message.get("params") or _EMPTY).get("arguments") or _EMPTY
         
         # Extract method and params from the tool arguments
         method = params.get("method")
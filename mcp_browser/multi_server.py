@@ -7,10 +7,10 @@ automatically started with the browser.
 
 import os
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
-from .server import MCPServer
+from .server import MCPServer, INITIALIZE_PARAMS
 from .config import MCPServerConfig
 from .logging_config import get_logger
 
@@ -21,6 +21,10 @@ class MultiServerManager:
     def __init__(self, logger=None):
         self.logger = logger or get_logger(__name__)
         self.servers: Dict[str, MCPServer] = {}
+        # Keeps calls to one server in order during parallel routing
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Bumped whenever the set of servers (and so of tools) changes
+        self.version = 0
         self.builtin_servers = self._get_builtin_servers()
         
     def _get_builtin_servers(self) -> Dict[str, MCPServerConfig]:
@@ -70,16 +74,10 @@ class MultiServerManager:
             try:
                 await server.start()
                 self.servers[name] = server
+                self.version += 1
                 
                 # Initialize each server
-                await server.send_request("initialize", {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "mcp-browser",
-                        "version": "0.1.0"
-                    }
-                })
+                await server.send_request("initialize", INITIALIZE_PARAMS)
                 self.logger.info(f"Successfully initialized {name}")
             except Exception as e:
                 self.logger.error(f"Failed to initialize {name}: {e}")
@@ -92,16 +90,10 @@ class MultiServerManager:
         server = MCPServer(config, logger=get_logger(__name__, name))
         await server.start()
         self.servers[name] = server
+        self.version += 1
         
         # Initialize
-        await server.send_request("initialize", {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {
-                "name": "mcp-browser",
-                "version": "0.1.0"
-            }
-        })
+        await server.send_request("initialize", INITIALIZE_PARAMS)
     
     async def get_all_tools(self) -> List[Dict[str, Any]]:
         """Get tools from all servers."""
@@ -131,9 +123,8 @@ class MultiServerManager:
     async def route_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Route a tool call to the appropriate server."""
         # Check if tool has server prefix
-        if "::" in tool_name:
-            server_name, actual_tool = tool_name.split("::", 1)
-            
+        server_name, sep, actual_tool = tool_name.partition("::")
+        if sep:
             if server_name in self.servers:
                 # Call the tool on the specific server
                 response = await self.servers[server_name].send_request("tools/call", {
@@ -157,6 +148,42 @@ class MultiServerManager:
             
             raise Exception(f"Tool {tool_name} not found in any server")
     
+    async def route_tool_calls_parallel(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Route several tool calls, running different servers concurrently.
+        
+        Calls are grouped by their server prefix. Each group holds that
+        server's lock and runs its calls in order, while the groups run in
+        parallel. Unprefixed names are routed one by one as in
+        route_tool_call().
+        
+        Args:
+            calls: (tool_name, arguments) pairs
+            
+        Returns:
+            Results in call order; a failed call yields its exception
+        """
+        results: List[Any] = [None] * len(calls)
+        groups: Dict[str, List[int]] = {}
+        for index, (tool_name, _) in enumerate(calls):
+            server_name, sep, _ = tool_name.partition("::")
+            groups.setdefault(server_name if sep else "", []).append(index)
+        
+        async def run_group(server_name: str, indices: List[int]):
+            lock = self._locks.get(server_name)
+            if lock is None:
+                lock = self._locks[server_name] = asyncio.Lock()
+            async with lock:
+                for index in indices:
+                    tool_name, arguments = calls[index]
+                    try:
+                        results[index] = await self.route_tool_call(tool_name, arguments)
+                    except Exception as e:
+                        results[index] = e
+        
+        await asyncio.gather(*(run_group(name, indices) for name, indices in groups.items()))
+        return results
+    
     async def stop_all(self):
         """Stop all servers."""
         # Create a copy of the dictionary to avoid iteration errors
@@ -169,4 +196,5 @@ class MultiServerManager:
             except Exception as e:
                 self.logger.error(f"Error stopping server {name}: {e}")
         
-        self.servers.clear()
\ No newline at end of file
+        self.servers.clear()
+        self.version += 1
\ No newline at end of file
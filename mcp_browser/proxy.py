@@ -5,20 +5,120 @@ Provides a generic, minimalistic interface for interacting with MCP servers
 with automatic routing, sparse mode, and context optimization.
 """
 
+import os
+import re
+import sys
 import json
+import shutil
 import asyncio
-from typing import Dict, Any, Optional, Union
+import weakref
+import hashlib
+import heapq
+import itertools
+from typing import Dict, Any, Optional, Union, Callable, Awaitable, List, Tuple
 from pathlib import Path
 
 from .config import ConfigLoader, MCPBrowserConfig
-from .server import MCPServer
+from .server import MCPServer, MCPError, INITIALIZE_PARAMS
 from .multi_server import MultiServerManager
 from .registry import ToolRegistry
 from .filter import MessageFilter, VirtualToolHandler
 from .buffer import JsonRpcBuffer
+from .config_watch import get_watch_hub
+from ._json import dumps, dumps_bytes
 from .logging_config import get_logger, TRACE
 
 
+# Fixed JSON-RPC error payloads, shared by every error response
+_ERR_TIMEOUT = {"code": -32603, "message": "Request timeout"}
+_ERR_NO_SERVER = {"code": -32603, "message": "No MCP server available"}
+_ERR_PROMPT_NOT_FOUND = {"code": -32602, "message": "Prompt not found"}
+_ERR_RESOURCE_NOT_FOUND = {"code": -32602, "message": "Resource not found"}
+
+# Fixed results, shared by every response. Responses are only serialized,
+# never modified, so these are never copied.
+_INIT_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "mcp-browser",
+        "version": "0.1.0"
+    }
+}
+_EMPTY_PROMPTS = {"prompts": []}
+_EMPTY_RESOURCES = {"resources": []}
+_EMPTY_COMPLETION = {"completion": {"values": []}}
+
+# Stand-in for missing params/arguments; only ever read, never modified
+_EMPTY: Dict[str, Any] = {}
+
+# Method names dispatched by MCPBrowser.call
+_INITIALIZE = sys.intern("initialize")
+_TOOLS_CALL = sys.intern("tools/call")
+
+# Flush queued writes early once this many requests are waiting
+_MAX_WRITE_BATCH = 64
+
+# Tool catalogs from previous runs, one file per main server name; each
+# records the server setup it was fetched with (see _catalog_fingerprint)
+CATALOG_CACHE_DIR = Path.home() / ".cache" / "mcp-browser"
+
+# Characters not kept from a server name in its catalog file name
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9_.-]")
+# Catalog files of earlier versions, named by a setup hash; removed on write
+_LEGACY_CATALOG_RE = re.compile(r"[0-9a-f]{40}\.json")
+
+
+def _group_by_server(tools: List[Dict[str, Any]], default_server: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Split a tool catalog by the server each tool came from.
+    
+    Built-in server tools carry their server in "_server" (see
+    MultiServerManager.get_all_tools); the rest belong to default_server.
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for tool in tools:
+        server_name = tool.get("_server", default_server)
+        group = groups.get(server_name)
+        if group is None:
+            group = groups[server_name] = []
+        group.append(tool)
+    return groups
+
+
+def _make_error(request_id: Any, error: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a JSON-RPC error response around an error payload."""
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+def _error_from(exc: Exception) -> Dict[str, Any]:
+    """Build an error payload for exc, keeping a server's own error code."""
+    if isinstance(exc, MCPError):
+        return exc.to_error()
+    return {"code": -32603, "message": str(exc)}
+
+
+def install_uvloop() -> bool:
+    """
+    Switch asyncio to uvloop's event loop policy if uvloop is installed.
+    
+    Must be called before the event loop is created (i.e. before
+    asyncio.run()); the CLI entry points do this automatically.
+    
+    Returns:
+        True if uvloop is now the active policy, False otherwise
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 class MCPBrowser:
     """
     Generic MCP protocol browser with minimal API.
@@ -40,6 +140,8 @@ class MCPBrowser:
         """
         self.config_loader = ConfigLoader(config_path)
         self.config: Optional[MCPBrowserConfig] = None
+        # Hot-path copies of config values, refreshed by _cache_config_values()
+        self._timeout: float = MCPBrowserConfig.timeout
         self.server: Optional[MCPServer] = None
         self.multi_server: Optional[MultiServerManager] = None
         self.registry = ToolRegistry()
@@ -48,12 +150,51 @@ class MCPBrowser:
         self._server_name = server_name
         self._enable_builtin_servers = enable_builtin_servers
         self._initialized = False
+        self._init_task: Optional[asyncio.Task] = None
         self._response_buffer: Dict[Union[str, int], asyncio.Future] = {}
-        self._next_id = 1
+        # Ids for requests sent without one
+        self._ids = itertools.count(1)
+        # Heap of (deadline, sequence, request_id, weak reference to the
+        # future) for forwarded requests; one timer for the earliest entry
+        # covers them all. The timeout can change on a config reload, so
+        # deadlines do not always arrive in order. The sequence number
+        # breaks ties without comparing ids. The reference is weak so an
+        # answered request's future and response are freed at once, not
+        # when its deadline comes up.
+        self._deadlines: List[Tuple[float, int, Union[str, int], Callable[[], Optional[asyncio.Future]]]] = []
+        self._deadline_seq = itertools.count()
+        self._sweep_handle: Optional[asyncio.TimerHandle] = None
+        # Outgoing frames queued for the next event-loop tick
+        self._write_buf: List[bytes] = []
+        self._write_scheduled = False
         self.logger = get_logger(__name__)
         self._config_watcher = None
         self._server_configs = {}
         self._config_mtime = None
+        self._catalog_refresh: Optional[asyncio.Task] = None
+        # multi_server.version the registry last got built-in tools for, in
+        # builtin-only mode
+        self._builtin_list_version: Optional[int] = None
+        # Hot-path dispatch tables for tools/call
+        self._virtual_dispatch: Dict[str, Callable[[dict], Awaitable[dict]]] = {}
+        self._special_dispatch: Dict[str, Callable[[dict, Any], Awaitable[dict]]] = {
+            "onboarding": self._call_builtin_onboarding
+        }
+        # Handlers return a response, or None to continue normal routing
+        self._method_handlers: Dict[str, Callable[[dict, Any], Awaitable[Optional[dict]]]] = {
+            _INITIALIZE: self._handle_initialize,
+            _TOOLS_CALL: self._handle_tools_call,
+        }
+        # Method handlers for builtin-only mode (no main server)
+        self._builtin_dispatch: Dict[str, Callable[[dict, Any], Awaitable[dict]]] = {
+            "tools/list": self._builtin_tools_list,
+            "tools/call": self._builtin_tools_call,
+            "prompts/list": self._builtin_prompts_list,
+            "prompts/get": self._builtin_prompts_get,
+            "resources/list": self._builtin_resources_list,
+            "resources/read": self._builtin_resources_read,
+            "completion/complete": self._builtin_completion,
+        }
         
     async def __aenter__(self):
         """Async context manager entry."""
@@ -65,12 +206,30 @@ class MCPBrowser:
         await self.close()
         
     async def initialize(self):
-        """Initialize the browser and start MCP server."""
+        """
+        Initialize the browser and start MCP server.
+        
+        Safe to call concurrently: all callers wait for a single startup,
+        and a failed startup can be retried by the next call.
+        """
         if self._initialized:
             return
-            
+        
+        if self._init_task is None:
+            self._init_task = asyncio.create_task(self._do_initialize())
+        task = self._init_task
+        try:
+            # Shielded so one caller being cancelled doesn't abort startup
+            await asyncio.shield(task)
+        finally:
+            if task.done() and self._init_task is task:
+                self._init_task = None
+    
+    async def _do_initialize(self):
+        """Run the actual startup; see initialize()."""
         # Load configuration
         self.config = self.config_loader.load()
+        self._cache_config_values()
         
         # Determine which server to use
         server_name = self._server_name or self.config.default_server
@@ -95,6 +254,7 @@ class MCPBrowser:
         # Create filter and handler
         self.filter = MessageFilter(self.registry, sparse_mode=self.config.sparse_mode)
         self.virtual_handler = VirtualToolHandler(self.registry, self._forward_to_server)
+        self._virtual_dispatch = self.virtual_handler.dispatch
         
         # Initialize connection
         await self._initialize_connection()
@@ -110,11 +270,20 @@ class MCPBrowser:
     async def close(self):
         """Close the browser and stop all MCP servers."""
         if self._config_watcher:
-            self._config_watcher.cancel()
+            self._config_watcher.unregister(self.config_loader.config_path, self._on_config_changed)
+            self._config_watcher = None
+        if self._catalog_refresh:
+            self._catalog_refresh.cancel()
+        # Don't drop requests still waiting for the next write
+        if self._write_buf:
+            self._flush_writes()
         if self.server:
             await self.server.stop()
         if self.multi_server:
+            stopped = list(self.multi_server.servers)
             await self.multi_server.stop_all()
+            for name in stopped:
+                self.registry.remove_server_tools(name)
         self._initialized = False
         
     async def call(self, jsonrpc_object: Dict[str, Any]) -> Dict[str, Any]:
@@ -124,7 +293,8 @@ class MCPBrowser:
         This is the main generic interface for all MCP operations.
         
         Args:
-            jsonrpc_object: Complete JSON-RPC request object
+            jsonrpc_object: Complete JSON-RPC request object. If it has no
+                "id", one is assigned by adding it to this dict.
             
         Returns:
             JSON-RPC response object
@@ -140,192 +310,170 @@ class MCPBrowser:
                 }
             })
         """
-        # Ensure request has an ID
-        if "id" not in jsonrpc_object:
-            jsonrpc_object = jsonrpc_object.copy()
-            jsonrpc_object["id"] = self._next_id
-            self._next_id += 1
-        
-        request_id = jsonrpc_object["id"]
-        
-        # Handle initialize request specially when acting as a server
-        if jsonrpc_object.get("method") == "initialize":
-            # Initialize ourselves if needed
-            if not self._initialized:
-                await self.initialize()
-            
-            # Return our capabilities
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "serverInfo": {
-                        "name": "mcp-browser",
-                        "version": "0.1.0"
-                    }
-                }
-            }
+        # Ensure request has an ID (assigned in place, no copy)
+        if "id" in jsonrpc_object:
+            request_id = jsonrpc_object["id"]
+        else:
+            request_id = jsonrpc_object["id"] = next(self._ids)
+        
+        method = jsonrpc_object.get("method")
         
-        # Initialize if needed for other requests
+        # Initialize ourselves if needed (also for initialize requests)
         if not self._initialized:
             await self.initialize()
         
-        # Check if this is a virtual tool call
-        if jsonrpc_object.get("method") == "tools/call":
-            tool_name = jsonrpc_object.get("params", {}).get("name")
-            
-            if self.filter.is_virtual_tool(tool_name):
-                # Handle virtual tool locally
-                response = await self.virtual_handler.handle_tool_call(jsonrpc_object)
-                if response:
-                    return response
-            elif tool_name == "onboarding" and self.multi_server:
-                # Special handling for onboarding tool - route to built-in server
-                try:
-                    args = jsonrpc_object.get("params", {}).get("arguments", {})
-                    response = await self.multi_server.route_tool_call(
-                        "builtin:onboarding::onboarding", args
-                    )
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": response
-                    }
-                except Exception as e:
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {"code": -32603, "message": str(e)}
-                    }
+        # Methods answered (or partly answered) by the browser itself
+        handler = self._method_handlers.get(method)
+        if handler:
+            response = await handler(jsonrpc_object, request_id)
+            if response is not None:
+                return response
         
         # Check if we have a server
         if not self.server:
-            # In builtin-only mode, try to route to multi-server
+            # In builtin-only mode, route to multi-server based on method
             if self.multi_server:
-                # Try to route based on method
-                method = jsonrpc_object.get("method")
-                
-                if method == "tools/list":
-                    # Get all tools and apply sparse filter
-                    tools = await self.multi_server.get_all_tools()
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {"tools": tools}
-                    }
-                    # Always filter to show only sparse tools
-                    filtered_response = self.filter.filter_incoming(response)
-                    return filtered_response
-                    
-                elif method == "tools/call":
-                    # Route tool call to multi-server
-                    tool_name = jsonrpc_object.get("params", {}).get("name")
-                    args = jsonrpc_object.get("params", {}).get("arguments", {})
-                    try:
-                        result = await self.multi_server.route_tool_call(tool_name, args)
-                        return {
-                            "jsonrpc": "2.0",
-                            "id": request_id,
-                            "result": result
-                        }
-                    except Exception as e:
-                        return {
-                            "jsonrpc": "2.0",
-                            "id": request_id,
-                            "error": {"code": -32603, "message": str(e)}
-                        }
-                
-                elif method == "prompts/list":
-                    # No prompts in builtin-only mode
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {"prompts": []}
-                    }
-                
-                elif method == "prompts/get":
-                    # No prompts available
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {"code": -32602, "message": "Prompt not found"}
-                    }
-                
-                elif method == "resources/list":
-                    # No resources in builtin-only mode
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {"resources": []}
-                    }
-                
-                elif method == "resources/read":
-                    # No resources available
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {"code": -32602, "message": "Resource not found"}
-                    }
-                
-                elif method == "completion/complete":
-                    # No completions in builtin-only mode
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {"completion": {"values": []}}
-                    }
+                builtin = self._builtin_dispatch.get(method)
+                if builtin:
+                    return await builtin(jsonrpc_object, request_id)
                 
-                else:
-                    # Unknown method
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {
-                            "code": -32601,
-                            "message": f"Method '{method}' not found"
-                        }
-                    }
+                # Unknown method
+                return _make_error(request_id, {
+                    "code": -32601,
+                    "message": f"Method '{method}' not found"
+                })
             
             # No server available
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32603,
-                    "message": "No MCP server available"
-                }
-            }
+            return _make_error(request_id, _ERR_NO_SERVER)
+        
+        raw_request = dumps_bytes(jsonrpc_object)
+        # Raw I/O is logged at trace level only; skip all formatting otherwise
+        trace_on = self.logger.isEnabledFor(TRACE)
+        if trace_on:
+            self.logger.log(TRACE, ">>> %s: %s", self._server_name, raw_request.decode())
+        
+        # Create future for response. Futures are deliberately not pooled: a
+        # done asyncio Future cannot be reset, and Tasks can only block on
+        # real Futures, so a free-list would need to poke at private state.
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._response_buffer[request_id] = future
         
-        # Log at trace level for raw I/O
-        raw_request = json.dumps(jsonrpc_object)
-        self.logger.log(TRACE, f">>> {self._server_name}: {raw_request}")
+        # Queue for sending; concurrent calls share one write per loop tick
+        self._write_buf.append(raw_request + b"\n")
+        if len(self._write_buf) >= _MAX_WRITE_BATCH:
+            self._flush_writes()
+        elif not self._write_scheduled:
+            self._write_scheduled = True
+            loop.call_soon(self._flush_writes)
+        
+        # Register the deadline; _sweep_timeouts resolves the future on expiry
+        deadline = loop.time() + self._timeout
+        heapq.heappush(self._deadlines, (deadline, next(self._deadline_seq), request_id, weakref.ref(future)))
+        handle = self._sweep_handle
+        if handle is None or deadline < handle.when():
+            if handle is not None:
+                handle.cancel()
+            self._sweep_handle = loop.call_at(deadline, self._sweep_timeouts)
+        
+        response = await future
+        if trace_on:
+            self.logger.log(TRACE, "<<< %s: %s", self._server_name, dumps(response))
+        return response
+    
+    async def call_many(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute several JSON-RPC calls concurrently.
         
-        # Create future for response
-        future = asyncio.Future()
-        self._response_buffer[request_id] = future
+        With a main server the requests are simply issued together and share
+        writes. In builtin-only mode, plain tool calls are grouped per
+        built-in server: different servers run in parallel and calls to the
+        same server keep their order.
         
-        # Send to server
-        self.server.send_raw(raw_request)
+        Args:
+            requests: JSON-RPC request objects; missing ids are assigned
+            
+        Returns:
+            JSON-RPC responses in request order
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        if self.server or not self.multi_server:
+            return list(await asyncio.gather(*(self.call(r) for r in requests)))
+        
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        routed: List[int] = []
+        others: List[int] = []
+        for index, request in enumerate(requests):
+            if "id" not in request:
+                request["id"] = next(self._ids)
+            params = request.get("params") or _EMPTY
+            tool_name = params.get("name")
+            if (request.get("method") == _TOOLS_CALL and isinstance(tool_name, str) and
+                    tool_name not in self._virtual_dispatch and
+                    tool_name not in self._special_dispatch):
+                routed.append(index)
+            else:
+                others.append(index)
+        
+        async def route():
+            calls = [(requests[i]["params"]["name"], requests[i]["params"].get("arguments") or _EMPTY)
+                     for i in routed]
+            results = await self.multi_server.route_tool_calls_parallel(calls)
+            for index, result in zip(routed, results):
+                request_id = requests[index]["id"]
+                if isinstance(result, Exception):
+                    responses[index] = _make_error(request_id, _error_from(result))
+                else:
+                    responses[index] = {"jsonrpc": "2.0", "id": request_id, "result": result}
         
-        # Wait for response
+        async def call_other(index: int):
+            responses[index] = await self.call(requests[index])
+        
+        await asyncio.gather(route(), *(call_other(i) for i in others))
+        return responses
+    
+    def _flush_writes(self):
+        """Send all queued requests to the server in a single write."""
+        self._write_scheduled = False
+        if not self._write_buf:
+            return
+        
+        data = b"".join(self._write_buf)
+        self._write_buf.clear()
+        
+        if not self.server:
+            return
         try:
-            response = await asyncio.wait_for(future, timeout=self.config.timeout)
-            self.logger.log(TRACE, f"<<< {self._server_name}: {json.dumps(response)}")
-            return response
-        except asyncio.TimeoutError:
-            del self._response_buffer[request_id]
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32603,
-                    "message": "Request timeout"
-                }
-            }
+            self.server.send_raw(data)
+        except Exception as e:
+            # Pending futures will be resolved by their timeouts
+            self.logger.error(f"Failed to send to server: {e}")
+    
+    def _sweep_timeouts(self):
+        """Resolve every expired pending request with a timeout error."""
+        self._sweep_handle = None
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        deadlines = self._deadlines
+        
+        while deadlines and deadlines[0][0] <= now:
+            _, _, request_id, future_ref = heapq.heappop(deadlines)
+            future = future_ref()
+            if future is None:
+                # Answered, and its caller is done with it
+                continue
+            # Skip requests already answered (or whose id was reused since)
+            current = self._response_buffer.pop(request_id, None)
+            if current is future:
+                if not future.done():
+                    future.set_result(_make_error(request_id, _ERR_TIMEOUT))
+            elif current is not None:
+                self._response_buffer[request_id] = current
+        
+        if deadlines:
+            self._sweep_handle = loop.call_at(deadlines[0][0], self._sweep_timeouts)
     
     def discover(self, jsonpath: str) -> Any:
         """
@@ -358,48 +506,242 @@ class MCPBrowser:
             return
             
         # Send initialize request directly to server
-        init_response = await self.server.send_request("initialize", {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {
-                "name": "mcp-browser",
-                "version": "0.1.0"
-            }
-        })
+        init_response = await self.server.send_request("initialize", INITIALIZE_PARAMS)
         
         if "error" in init_response:
             raise RuntimeError(f"Failed to initialize: {init_response['error']}")
         
+        # Serve the catalog from the previous run if the server setup is
+        # unchanged, and only refresh it in the background
+        server_name = self._server_name or self.config.default_server
+        cache_path = self._catalog_cache_path(server_name)
+        fingerprint = self._catalog_fingerprint(server_name)
+        cached = self._load_catalog(cache_path, fingerprint)
+        if cached is not None:
+            self.registry.update_tools_by_server(_group_by_server(cached, str(server_name)))
+            self._catalog_refresh = asyncio.create_task(
+                self._refresh_catalog(cache_path, fingerprint, cached))
+        else:
+            await self._refresh_catalog(cache_path, fingerprint, None)
+    
+    async def _fetch_catalog(self) -> List[Dict[str, Any]]:
+        """Query tools/list on the main server and all built-in servers."""
+        tools: List[Dict[str, Any]] = []
+        
         # Get tool list from main server
         if self.server:
-            tools_response = await self.server.send_request("tools/list", {})
+            # send_request returns the result and raises on error responses.
+            # A result without a tool list is treated as a failure so that a
+            # bad reply never replaces a good cached catalog.
+            tools_result = await self.server.send_request("tools/list", {})
             
-            if "error" in tools_response:
-                raise RuntimeError(f"Failed to list tools: {tools_response['error']}")
-                
-            # Update registry with tools
-            if "result" in tools_response and "tools" in tools_response["result"]:
-                self.registry.update_tools(tools_response["result"]["tools"])
+            if not isinstance(tools_result, dict) or not isinstance(tools_result.get("tools"), list):
+                raise RuntimeError(f"Failed to list tools: unexpected result {tools_result!r}")
+            
+            tools.extend(tools_result["tools"])
         
         # Also get tools from multi-server if enabled
         if self.multi_server:
-            builtin_tools = await self.multi_server.get_all_tools()
-            # Add to registry without going through filter
-            existing_tools = self.registry.raw_tool_list
-            self.registry.update_tools(existing_tools + builtin_tools)
+            tools.extend(await self.multi_server.get_all_tools())
+        
+        return tools
+    
+    async def _refresh_catalog(self, cache_path: Path, fingerprint: str,
+                               cached: Optional[List[Dict[str, Any]]]):
+        """Fetch the live tool catalog, updating registry and cache if it changed."""
+        try:
+            tools = await self._fetch_catalog()
+        except Exception as e:
+            if cached is None:
+                raise
+            self.logger.warning(f"Catalog refresh failed, keeping cached tools: {e}")
+            return
+        
+        if tools == cached:
+            return
+        
+        # Add to registry without going through filter; only servers whose
+        # tools changed are re-indexed
+        server_name = self._server_name or self.config.default_server
+        self.registry.update_tools_by_server(_group_by_server(tools, str(server_name)))
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-process temp name, so concurrent proxies never share one
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(dumps({"fingerprint": fingerprint, "tools": tools}))
+            tmp_path.replace(cache_path)
+            for path in cache_path.parent.iterdir():
+                if _LEGACY_CATALOG_RE.fullmatch(path.name):
+                    path.unlink()
+        except OSError as e:
+            self.logger.warning(f"Failed to write tool catalog cache: {e}")
+    
+    def _load_catalog(self, cache_path: Path, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+        """Read a cached tool catalog, or None if missing, unreadable or stale."""
+        try:
+            data = json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+            return None
+        tools = data.get("tools")
+        return tools if isinstance(tools, list) else None
+    
+    def _catalog_cache_path(self, server_name: str) -> Path:
+        """Path of the cached tool catalog for a main server."""
+        return CATALOG_CACHE_DIR / f"{_UNSAFE_FILENAME_RE.sub('_', str(server_name))}.json"
+    
+    def _catalog_fingerprint(self, server_name: str) -> str:
+        """
+        Hash of the current server setup, stored with the cached catalog.
+        
+        It covers everything that can change the catalog: the main
+        server's command, args and env, the config file mtime, the mtime
+        of any server script named on a command line, and the registered
+        built-in servers. A cached catalog with another fingerprint is
+        ignored and replaced.
+        """
+        key_data = {"server": server_name, "config_mtime": None, "servers": []}
+        
+        config_path = self.config_loader.config_path
+        if config_path and config_path.exists():
+            key_data["config_mtime"] = config_path.stat().st_mtime
+        
+        server_configs = []
+        if self.server:
+            server_configs.append((server_name, self.server.config))
+        if self.multi_server:
+            server_configs.extend(sorted(self.multi_server.builtin_servers.items()))
+        
+        for name, config in server_configs:
+            argv = list(config.command) + list(config.args)
+            sources = {}
+            for i, arg in enumerate(argv):
+                path = shutil.which(arg) if i == 0 else arg
+                if path and os.path.isfile(path):
+                    sources[arg] = os.stat(path).st_mtime
+            key_data["servers"].append({
+                "name": name,
+                "argv": argv,
+                "env": config.env,
+                "sources": sources,
+            })
+        
+        return hashlib.sha1(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
     
     def _handle_server_message(self, message: dict):
         """Handle incoming message from MCP server."""
-        # Apply incoming filter
-        filtered = self.filter.filter_incoming(message)
-        if not filtered:
+        # Only responses to our own pending requests are of interest; anything
+        # else (notifications, replies to MCPServer.send_request) is left alone
+        msg_id = message.get("id")
+        future = self._response_buffer.pop(msg_id, None) if msg_id is not None else None
+        if future is None:
             return
         
-        # Check if this is a response to a pending request
-        msg_id = filtered.get("id")
-        if msg_id in self._response_buffer:
-            future = self._response_buffer.pop(msg_id)
-            future.set_result(filtered)
+        # Plain results are passed through untouched; only tools/list results
+        # and errors can be rewritten or blocked by the filter. The message
+        # dict is ours now, so filter it in place; the filter swaps in a new
+        # result object, as MCPServer may have handed the original one to
+        # its own caller. This stays on
+        # the loop even for big catalogs: it is one dict build plus the
+        # cached sparse list (~80us for 1000 tools), cheaper than a thread
+        # hop, and the registry is not safe to mutate from another thread.
+        result = message.get("result")
+        if (type(result) is dict and "tools" in result) or "error" in message:
+            if not self.filter.filter_incoming_inplace(message):
+                self._response_buffer[msg_id] = future
+                return
+        
+        if not future.done():
+            future.set_result(message)
+    
+    async def _handle_initialize(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """Answer an initialize request with our own capabilities."""
+        return {"jsonrpc": "2.0", "id": request_id, "result": _INIT_RESULT}
+    
+    async def _handle_tools_call(self, jsonrpc_object: dict, request_id: Any) -> Optional[dict]:
+        """Handle virtual and specially routed tools; None for everything else."""
+        tool_name = (jsonrpc_object.get("params") or _EMPTY).get("name")
+        
+        # Handle virtual tool locally
+        handler = self._virtual_dispatch.get(tool_name)
+        if handler:
+            return await handler(jsonrpc_object)
+        
+        if self.multi_server:
+            # Tools with special routing (e.g. onboarding -> built-in server)
+            special = self._special_dispatch.get(tool_name)
+            if special:
+                return await special(jsonrpc_object, request_id)
+        
+        return None
+    
+    async def _call_builtin_onboarding(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """Route the onboarding tool to the built-in onboarding server."""
+        try:
+            args = (jsonrpc_object.get("params") or _EMPTY).get("arguments") or _EMPTY
+            response = await self.multi_server.route_tool_call(
+                "builtin:onboarding::onboarding", args
+            )
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "result": response
+            }
+        except Exception as e:
+            return _make_error(request_id, _error_from(e))
+    
+    async def _builtin_tools_list(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """
+        List built-in server tools, always filtered to the sparse set.
+        
+        The registry keeps the built-in tools until the set of built-in
+        servers changes, so repeated listings skip the tools/list round
+        trip to every built-in server. The sparse set itself comes from
+        the registry each time, as its counts also follow config reloads.
+        """
+        version = self.multi_server.version
+        if self._builtin_list_version != version:
+            tools = await self.multi_server.get_all_tools()
+            self.registry.update_tools_by_server(_group_by_server(tools, ""))
+            self._builtin_list_version = version
+        
+        return {"jsonrpc": "2.0", "id": request_id, "result": {"tools": self.registry.get_sparse_tools()}}
+    
+    async def _builtin_tools_call(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """Route a tool call to the built-in servers."""
+        params = jsonrpc_object.get("params") or _EMPTY
+        try:
+            result = await self.multi_server.route_tool_call(
+                params.get("name"), params.get("arguments") or _EMPTY
+            )
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "result": result
+            }
+        except Exception as e:
+            return _make_error(request_id, _error_from(e))
+    
+    async def _builtin_prompts_list(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """No prompts in builtin-only mode."""
+        return {"jsonrpc": "2.0", "id": request_id, "result": _EMPTY_PROMPTS}
+    
+    async def _builtin_prompts_get(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """No prompts available."""
+        return _make_error(request_id, _ERR_PROMPT_NOT_FOUND)
+    
+    async def _builtin_resources_list(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """No resources in builtin-only mode."""
+        return {"jsonrpc": "2.0", "id": request_id, "result": _EMPTY_RESOURCES}
+    
+    async def _builtin_resources_read(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """No resources available."""
+        return _make_error(request_id, _ERR_RESOURCE_NOT_FOUND)
+    
+    async def _builtin_completion(self, jsonrpc_object: dict, request_id: Any) -> dict:
+        """No completions in builtin-only mode."""
+        return {"jsonrpc": "2.0", "id": request_id, "result": _EMPTY_COMPLETION}
     
     async def _forward_to_server(self, request: dict) -> dict:
         """Forward a request to the MCP server and get response."""
@@ -415,36 +757,32 @@ class MCPBrowser:
         # Store initial mtime
         self._config_mtime = config_path.stat().st_mtime
         
-        async def watch_config():
-            """Watch for config file changes."""
-            while True:
-                try:
-                    await asyncio.sleep(2)  # Check every 2 seconds
-                    
-                    if not config_path.exists():
-                        continue
-                        
-                    current_mtime = config_path.stat().st_mtime
-                    if current_mtime != self._config_mtime:
-                        self.logger.info("Config file changed, reloading...")
-                        self._config_mtime = current_mtime
-                        
-                        # Reload config
-                        try:
-                            new_config = self.config_loader.load()
-                            self.config = new_config
-                            self._update_server_configs()
-                            self.logger.info("Config reloaded successfully")
-                        except Exception as e:
-                            self.logger.error(f"Failed to reload config: {e}")
-                            
-                except asyncio.CancelledError:
-                    break
-                except Exception as e:
-                    self.logger.error(f"Config watcher error: {e}")
-                    await asyncio.sleep(5)
-        
-        self._config_watcher = asyncio.create_task(watch_config())
+        # One shared watcher task serves every browser on this loop
+        self._config_watcher = get_watch_hub()
+        self._config_watcher.register(config_path, self._on_config_changed)
+    
+    def _on_config_changed(self, mtime: float):
+        """Reload the configuration after the config file changed."""
+        # The mtime check also debounces repeated notifications
+        if mtime == self._config_mtime:
+            return
+        
+        self.logger.info("Config file changed, reloading...")
+        self._config_mtime = mtime
+        
+        # Reload config
+        try:
+            new_config = self.config_loader.load()
+            self.config = new_config
+            self._cache_config_values()
+            self._update_server_configs()
+            self.logger.info("Config reloaded successfully")
+        except Exception as e:
+            self.logger.error(f"Failed to reload config: {e}")
+    
+    def _cache_config_values(self):
+        """Copy config values read on every request into plain attributes."""
+        self._timeout = self.config.timeout
     
     def _update_server_configs(self):
         """Update server configurations for discovery."""
@@ -460,13 +798,18 @@ class MCPBrowser:
                 }
         
         # Update registry metadata with server info
-        self.registry._metadata["servers"] = self._server_configs
+        self.registry.update_metadata("servers", self._server_configs)
 
 
 # Convenience function for simple usage
 async def create_browser(config_path: Optional[Path] = None, 
                         server_name: Optional[str] = None) -> MCPBrowser:
-    """Create and initialize an MCP Browser instance."""
+    """
+    Create and initialize an MCP Browser instance.
+    
+    The event loop is already running here, so call install_uvloop()
+    before asyncio.run() to get uvloop's faster futures and streams.
+    """
     browser = MCPBrowser(config_path, server_name)
     await browser.initialize()
     return browser
\ No newline at end of file
@@ -5,20 +5,270 @@ Manages tool descriptions, provides JSONPath-based discovery,
 and supports sparse mode for context optimization.
 """
 
-import json
 import re
-from typing import Dict, Any, List, Optional, Union
+import sys
+import itertools
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple, Union
 from jsonpath_ng import parse as jsonpath_parse
 from jsonpath_ng.exceptions import JsonPathParserError
 
+from ._json import dumps, dumps_pretty
+
+try:
+    # Linear-time matching for user-supplied patterns (google-re2)
+    import re2
+except ImportError:
+    re2 = None
+
+
+# Capabilities inferred from keywords in tool names, and from descriptions
+_NAME_CAPABILITIES = (
+    ("file_operations", ("read", "write", "file")),
+    ("search_operations", ("search", "query", "find")),
+    ("web_operations", ("web", "http", "url")),
+    ("version_control", ("git", "repo", "commit")),
+    ("data_storage", ("memory", "store", "save")),
+    ("command_execution", ("exec", "run", "command")),
+)
+_DESC_CAPABILITY = "web_scraping"
+_DESC_KEYWORDS = ("browser", "scrape", "crawl")
+_CAPABILITY_COUNT = len(_NAME_CAPABILITIES) + 1
+
+# Lowercased tool names and descriptions for the capability rules; the same
+# strings come back on every catalog refresh and document rebuild
+_lower = lru_cache(maxsize=2048)(str.lower)
+
+
+def _intern_names(tools: List[Dict[str, Any]]):
+    """
+    Intern tool names in place.
+    
+    Names are looked up over and over (get_tool, discovery, server
+    attribution); interned keys let those lookups match on identity.
+    """
+    for tool in tools:
+        name = tool.get("name")
+        if type(name) is str:
+            tool["name"] = sys.intern(name)
+
+
+# Server key used by update_tools(), which replaces the whole catalog
+_ALL_SERVERS = ""
+
+# Bound on memoized discover() results kept between registry changes
+_DISCOVER_CACHE_SIZE = 256
+
+
+# Queries suggested by mcp_discover and the onboarding docs
+_CANONICAL_QUERIES = (
+    "$.tools[*]",
+    "$.tools[*].name",
+    "$.tools[*].inputSchema",
+    "$.servers[*]",
+)
+
+
+@lru_cache(maxsize=512)
+def _compile_jsonpath(jsonpath: str):
+    """
+    Parse a JSONPath expression once.
+    
+    Returns None for expressions that don't parse; the failure is cached
+    too, so repeated bad queries don't re-run the parser.
+    """
+    try:
+        return jsonpath_parse(jsonpath)
+    except (JsonPathParserError, Exception):
+        return None
+
+
+# Warm the cache so the first discovery doesn't pay for the parser
+for _query in _CANONICAL_QUERIES:
+    _compile_jsonpath(_query)
+del _query
+
+# Regex queries: $.tools[?(@.name =~ /pattern/flags)] and the description form
+_NAME_REGEX_PREFIX = "$.tools[?(@.name =~"
+_DESC_REGEX_PREFIX = "$.tools[?(@.description =~"
+_REGEX_EXTRACT = re.compile(r'/([^/]+)/([gi]*)')
+# Query prefix -> tool field the regex is matched against
+_REGEX_FIELDS = ((_NAME_REGEX_PREFIX, "name"), (_DESC_REGEX_PREFIX, "description"))
+
+
+@lru_cache(maxsize=256)
+def _compile_user_regex(pattern: str, flags_str: str) -> Optional[re.Pattern]:
+    """Compile a /pattern/flags regex from a query, or None if invalid."""
+    flags = 0
+    if 'i' in flags_str:
+        flags |= re.IGNORECASE
+    # 'g' needs no flag: every tool is searched anyway
+    try:
+        return re.compile(pattern, flags)
+    except re.error:
+        return None
+
+
+# Characters that make a regex more than a plain literal
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+@lru_cache(maxsize=256)
+def _user_regex_matcher(pattern: str, flags_str: str) -> Optional[Callable[[str], bool]]:
+    """
+    Return a predicate for a /pattern/flags query, or None if invalid.
+    
+    Plain alternations of ASCII literals such as /memory|task/i, the usual
+    shape of these queries, become substring checks that never enter the
+    regex engine; anything else uses RE2 when installed, else the compiled
+    regex.
+    """
+    regex = _compile_user_regex(pattern, flags_str)
+    if regex is None:
+        return None
+    
+    literals = pattern.split("|")
+    if not all(lit and lit.isascii() and _REGEX_METACHARS.isdisjoint(lit) for lit in literals):
+        if re2 is not None:
+            # No backtracking, so a hostile pattern cannot stall a scan over
+            # every description; RE2 rejects backreferences and lookaround,
+            # which stay with the re module
+            try:
+                return re2.compile(("(?i)" if 'i' in flags_str else "") + pattern).search
+            except Exception:
+                pass
+        return regex.search
+    
+    if 'i' in flags_str:
+        literals = tuple({lit.lower() for lit in literals})
+        return lambda text: any(lit in _lower(text) for lit in literals)
+    literals = tuple(set(literals))
+    return lambda text: any(lit in text for lit in literals)
+
+
+# $.tools[?(@.name=='X')], with either quote style
+_NAME_FILTER_RE = re.compile(r"""\$\.tools\[\?\(@\.name\s*==\s*(['"])(.*?)\1\)\]""")
+
+
+def _unwrap(values: List[Any]) -> Union[List[Any], Any, None]:
+    """Shape query results like discover(): None, a single value, or a list."""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return values
+
+
+def _select_field(tools: List[Dict[str, Any]], field: str) -> Union[List[Any], Any, None]:
+    """Equivalent of $.tools[*].<field>."""
+    return _unwrap([tool[field] for tool in tools if field in tool])
+
+
+# Direct implementations of the most common queries, bypassing the
+# jsonpath_ng tree walk; each takes the registry and returns exactly what
+# the walk would
+_FAST_PATHS = {
+    "$.tools[*]": lambda reg: _unwrap(list(reg.raw_tool_list)),
+    "$.tools[*].name": lambda reg: _select_field(reg.raw_tool_list, "name"),
+    "$.tools[*].description": lambda reg: _select_field(reg.raw_tool_list, "description"),
+    "$.tools[*].inputSchema": lambda reg: _select_field(reg.raw_tool_list, "inputSchema"),
+    "$.tool_names": lambda reg: reg.get_all_tool_names(),
+    "$.tool_names[*]": lambda reg: _unwrap(reg.get_all_tool_names()),
+    # jsonpath_ng applies [*] to a dict as the dict itself
+    "$.servers[*]": lambda reg: reg._metadata.get("servers", {}),
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Make a JSON-like template immutable: dicts become read-only views, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Copy a frozen template back into plain, serializable dicts and lists."""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+# Sparse-mode meta-tools. Only the counts in the descriptions vary. The
+# schema templates are frozen since every registry builds from them; each
+# sparse tool list gets its own plain copy, as JSON encoders reject the
+# read-only views.
+_MCP_DISCOVER_DESC = "🔍 PROXY META-TOOL: Discover {tool_count} hidden tools from {server_count} MCP servers without loading them into context. This prevents context explosion while enabling full tool access via JSONPath queries. Use this to explore what's available before calling specific tools."
+_MCP_DISCOVER_SCHEMA = _freeze({
+    "type": "object",
+    "properties": {
+        "jsonpath": {
+            "type": "string",
+            "description": "JSONPath expression to query tool catalog. Examples: '$.tools[*].name' (list all), '$.tools_by_name['Bash']' (find specific, fastest), '$.tools[?(@.name=='Bash')]' (filter), '$.servers[*]' (list servers)"
+        }
+    },
+    "required": ["jsonpath"]
+})
+
+_MCP_CALL_DESC = "🚀 PROXY META-TOOL: Execute any of the {tool_count} available MCP tools by constructing JSON-RPC calls. This is the universal interface to all hidden tools - you can call ANY tool discovered via mcp_discover without it being loaded into your context."
+_MCP_CALL_SCHEMA = _freeze({
+    "type": "object",
+    "properties": {
+        "method": {
+            "type": "string",
+            "description": "JSON-RPC method to call. For tool execution use 'tools/call'. Other methods: 'tools/list', 'prompts/list', 'resources/list'"
+        },
+        "params": {
+            "type": "object",
+            "description": "Method parameters. For 'tools/call': {'name': 'tool_name', 'arguments': {...}}. The arguments object contains the actual tool parameters."
+        }
+    },
+    "required": ["method", "params"]
+})
+
+_ONBOARDING_DESC = "📋 BUILT-IN TOOL: Manage persistent, identity-aware onboarding instructions. This tool lets AI instances leave instructions for future contexts based on identity (project name, user, etc). Perfect for maintaining context across sessions without consuming tokens."
+_ONBOARDING_SCHEMA = _freeze({
+    "type": "object",
+    "properties": {
+        "identity": {
+            "type": "string",
+            "description": "Identity key for onboarding instructions (e.g., 'Claude', 'MyProject', 'WebDev'). Each identity can have separate instructions."
+        },
+        "instructions": {
+            "type": "string",
+            "description": "Optional: New instructions to store. If omitted, retrieves existing instructions for this identity. Use this to leave notes for future AI sessions."
+        },
+        "append": {
+            "type": "boolean",
+            "description": "If true, append to existing instructions instead of replacing them entirely",
+            "default": False
+        }
+    },
+    "required": ["identity"]
+})
+
 
 class ToolRegistry:
     """Registry for MCP tools with discovery capabilities."""
     
     def __init__(self):
         self.tools: Dict[str, Any] = {}
-        self.raw_tool_list: List[Dict[str, Any]] = []
+        # Tool lists per server; raw_tool_list is their concatenation,
+        # built lazily (None means it needs rebuilding)
+        self._tools_by_server: Dict[str, List[Dict[str, Any]]] = {}
+        self._names_by_server: Dict[str, Set[str]] = {}
+        self._raw_tool_list: Optional[List[Dict[str, Any]]] = []
         self._metadata: Dict[str, Any] = {}
+        # discover() results, valid until the next mutation
+        self._discover_cache: Dict[str, Any] = {}
+        # get_full_api_documentation() result, valid until the next mutation
+        self._api_doc_cache: Optional[Dict[str, Any]] = None
+        # (tool_count, server_count, sparse tools, serialized sparse tools)
+        self._sparse_cache: Optional[Tuple[int, int, List[Dict[str, Any]], str]] = None
     
     def update_tools(self, tools: List[Dict[str, Any]]):
         """
@@ -27,13 +277,97 @@ class ToolRegistry:
         Args:
             tools: List of tool definitions from MCP server
         """
-        self.raw_tool_list = tools
-        self.tools.clear()
+        _intern_names(tools)
+        self._tools_by_server = {_ALL_SERVERS: tools}
+        self._names_by_server = {_ALL_SERVERS: {tool["name"] for tool in tools if "name" in tool}}
+        self._raw_tool_list = tools
+        self.tools = {tool["name"]: tool for tool in tools if "name" in tool}
+        self._invalidate()
+        # _sparse_cache is keyed on the counts, so it is only rebuilt if they change
+    
+    def _invalidate(self):
+        """Drop results derived from the tools or metadata."""
+        self._discover_cache.clear()
+        self._api_doc_cache = None
+    
+    @property
+    def raw_tool_list(self) -> List[Dict[str, Any]]:
+        """All tool definitions, in server order."""
+        if self._raw_tool_list is None:
+            self._raw_tool_list = list(itertools.chain.from_iterable(self._tools_by_server.values()))
+        return self._raw_tool_list
+    
+    def add_server_tools(self, server_name: str, tools: List[Dict[str, Any]]):
+        """
+        Set the tools of one server, leaving other servers' tools alone.
+        
+        Only that server's entries in the name index are touched, unless
+        one of its tool names is also provided by another server.
+        
+        Args:
+            server_name: Server the tools belong to
+            tools: Complete tool list of that server
+        """
+        _intern_names(tools)
+        server_name = sys.intern(server_name)
+        old_names = self._names_by_server.get(server_name, set())
+        new_names = {tool["name"] for tool in tools if "name" in tool}
+        self._tools_by_server[server_name] = tools
+        self._names_by_server[server_name] = new_names
+        self._raw_tool_list = None
+        self._invalidate()
+        
+        if self._names_shared(server_name, old_names | new_names):
+            self._rebuild_index()
+            return
         
+        for name in old_names - new_names:
+            del self.tools[name]
         for tool in tools:
             if "name" in tool:
                 self.tools[tool["name"]] = tool
     
+    def update_tools_by_server(self, tools_by_server: Dict[str, List[Dict[str, Any]]]):
+        """
+        Replace the whole catalog, given as the tool list of each server.
+        
+        Only the servers whose tool list changed are updated, and servers
+        not in tools_by_server are dropped; the rest stay as they are.
+        
+        Args:
+            tools_by_server: Server name -> complete tool list of that server
+        """
+        for server_name in [name for name in self._tools_by_server if name not in tools_by_server]:
+            self.remove_server_tools(server_name)
+        for server_name, tools in tools_by_server.items():
+            if self._tools_by_server.get(server_name) != tools:
+                self.add_server_tools(server_name, tools)
+    
+    def remove_server_tools(self, server_name: str):
+        """Drop all tools of one server."""
+        if self._tools_by_server.pop(server_name, None) is None:
+            return
+        names = self._names_by_server.pop(server_name)
+        self._raw_tool_list = None
+        self._invalidate()
+        
+        if self._names_shared(server_name, names):
+            self._rebuild_index()
+            return
+        
+        for name in names:
+            del self.tools[name]
+    
+    def _names_shared(self, server_name: str, names: Set[str]) -> bool:
+        """Check whether any of names is also provided by another server."""
+        return any(not names.isdisjoint(other)
+                   for other_server, other in self._names_by_server.items()
+                   if other_server != server_name)
+    
+    def _rebuild_index(self):
+        """Rebuild the name index from all servers; later servers win."""
+        self.tools = {tool["name"]: tool for tool in self.raw_tool_list if "name" in tool}
+    
     def get_tool(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a tool definition by name."""
         return self.tools.get(name)
@@ -50,39 +384,47 @@ class ToolRegistry:
             jsonpath: JSONPath expression to query tools
             
         Returns:
-            Query results or None if no matches
+            Query results or None if no matches. Results are memoized until
+            the registry changes, so treat them as read-only.
             
         Examples:
             $.tools[*].name - Get all tool names
-            $.tools[?(@.name=='Bash')] - Get Bash tool details
+            $.tools_by_name['Bash'] - Get Bash tool details
+            $.tools[?(@.name=='Bash')] - Same, via a filter
             $.tools[*].inputSchema - Get all input schemas
         """
+        try:
+            return self._discover_cache[jsonpath]
+        except KeyError:
+            pass
+        
+        result = self._discover(jsonpath)
+        
+        if len(self._discover_cache) >= _DISCOVER_CACHE_SIZE:
+            self._discover_cache.clear()
+        self._discover_cache[jsonpath] = result
+        return result
+    
+    def _discover(self, jsonpath: str) -> Union[List[Any], Any, None]:
+        """Run a discovery query without memoization."""
         # Check if this is a regex query and handle it specially
         if "=~" in jsonpath:
             return self._regex_search(jsonpath)
         
-        try:
-            expr = jsonpath_parse(jsonpath)
-        except (JsonPathParserError, Exception):
-            return None
-        
-        # Create a searchable structure
-        search_data = {
-            "tools": self.raw_tool_list,
-            "tool_names": self.get_all_tool_names(),
-            "metadata": self._metadata,
-            "servers": self._metadata.get("servers", {})
-        }
+        fast_path = _FAST_PATHS.get(jsonpath)
+        if fast_path is not None:
+            return fast_path(self)
         
-        # Execute JSONPath query
-        matches = expr.find(search_data)
+        # Lookup by exact name; jsonpath_ng's basic parser has no filters
+        match = _NAME_FILTER_RE.fullmatch(jsonpath)
+        if match:
+            name = match.group(2)
+            if name not in self.tools:
+                return None
+            # Scan rather than index: servers may share a tool name
+            return _unwrap([tool for tool in self.raw_tool_list if tool.get("name") == name])
         
-        if not matches:
-            return None
-        elif len(matches) == 1:
-            return matches[0].value
-        else:
-            return [match.value for match in matches]
+        return self._find(jsonpath)
     
     def _regex_search(self, jsonpath: str) -> Union[List[Any], Any, None]:
         """
@@ -91,187 +433,137 @@ class ToolRegistry:
         Supports patterns like: $.tools[?(@.name =~ /pattern/flags)]
         """
         # Parse basic regex patterns for tools
-        if "$.tools[?(@.name =~" in jsonpath:
-            # Extract regex pattern
-            match = re.search(r'/([^/]+)/([gi]*)', jsonpath)
-            if not match:
-                return None
-            
-            pattern = match.group(1)
-            flags_str = match.group(2)
-            
-            # Convert flags
-            flags = 0
-            if 'i' in flags_str:
-                flags |= re.IGNORECASE
-            if 'g' in flags_str:
-                pass  # Global is default behavior in Python findall
-            
-            try:
-                regex = re.compile(pattern, flags)
-            except re.error:
-                return None
-            
-            # Search through tools
-            matches = []
-            for tool in self.raw_tool_list:
-                tool_name = tool.get("name", "")
-                if regex.search(tool_name):
-                    matches.append(tool)
-            
-            return matches if matches else None
-        
-        elif "$.tools[?(@.description =~" in jsonpath:
-            # Extract regex pattern for descriptions
-            match = re.search(r'/([^/]+)/([gi]*)', jsonpath)
-            if not match:
-                return None
-            
-            pattern = match.group(1)
-            flags_str = match.group(2)
-            
-            flags = 0
-            if 'i' in flags_str:
-                flags |= re.IGNORECASE
-            
-            try:
-                regex = re.compile(pattern, flags)
-            except re.error:
-                return None
-            
-            # Search through tool descriptions
-            matches = []
-            for tool in self.raw_tool_list:
-                description = tool.get("description", "")
-                if regex.search(description):
-                    matches.append(tool)
-            
-            return matches if matches else None
+        for prefix, field in _REGEX_FIELDS:
+            if prefix in jsonpath:
+                # Extract regex pattern
+                match = _REGEX_EXTRACT.search(jsonpath)
+                if not match:
+                    return None
+                
+                matcher = _user_regex_matcher(match.group(1), match.group(2))
+                if matcher is None:
+                    return None
+                
+                matches = [tool for tool in self.raw_tool_list if matcher(tool.get(field, ""))]
+                return matches if matches else None
         
         # Fallback to basic JSONPath if regex pattern not recognized
         try:
-            expr = jsonpath_parse(jsonpath.replace("=~", "=="))  # Try basic equality
-            search_data = {
-                "tools": self.raw_tool_list,
-                "tool_names": self.get_all_tool_names(),
-                "metadata": self._metadata,
-                "servers": self._metadata.get("servers", {})
-            }
-            matches = expr.find(search_data)
-            if not matches:
-                return None
-            elif len(matches) == 1:
-                return matches[0].value
-            else:
-                return [match.value for match in matches]
+            return self._find(jsonpath.replace("=~", "=="))  # Try basic equality
         except:
             return None
     
+    def _find(self, jsonpath: str) -> Union[List[Any], Any, None]:
+        """Evaluate a query with jsonpath_ng against the searchable catalog."""
+        expr = _compile_jsonpath(jsonpath)
+        if expr is None:
+            return None
+        
+        # Create a searchable structure
+        search_data = {
+            "tools": self.raw_tool_list,
+            "tool_names": self.get_all_tool_names(),
+            # Name index, so single-tool lookups are a key access, not a filter walk
+            "tools_by_name": self.tools,
+            "metadata": self._metadata,
+            "servers": self._metadata.get("servers", {})
+        }
+        
+        return _unwrap([match.value for match in expr.find(search_data)])
+    
     def get_sparse_tools(self) -> List[Dict[str, Any]]:
         """
         Get minimal tool list for sparse mode.
         
-        Returns only essential meta-tools for discovery.
+        Returns only essential meta-tools for discovery. The list only
+        depends on the tool and server counts, so it is built once per
+        count pair and shared between calls; treat it as read-only.
         """
+        return self._get_sparse_cache()[2]
+    
+    def get_sparse_tools_json(self) -> str:
+        """Get the sparse tool list pre-serialized as a JSON array."""
+        return self._get_sparse_cache()[3]
+    
+    def _get_sparse_cache(self) -> Tuple[int, int, List[Dict[str, Any]], str]:
+        """Return the sparse tool cache, rebuilding it if the counts changed."""
         tool_count = len(self.tools)
         server_count = len(self._metadata.get("servers", {}))
         
-        sparse_tools = [
+        cache = self._sparse_cache
+        if cache is not None and cache[0] == tool_count and cache[1] == server_count:
+            return cache
+        
+        sparse_tools = self._build_sparse_tools(tool_count, server_count)
+        cache = (tool_count, server_count, sparse_tools, dumps(sparse_tools))
+        self._sparse_cache = cache
+        return cache
+    
+    def _build_sparse_tools(self, tool_count: int, server_count: int) -> List[Dict[str, Any]]:
+        """Build the meta-tool list shown in sparse mode."""
+        return [
             {
                 "name": "mcp_discover",
-                "description": f"🔍 PROXY META-TOOL: Discover {tool_count} hidden tools from {server_count} MCP servers without loading them into context. This prevents context explosion while enabling full tool access via JSONPath queries. Use this to explore what's available before calling specific tools.",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "jsonpath": {
-                            "type": "string",
-                            "description": "JSONPath expression to query tool catalog. Examples: '$.tools[*].name' (list all), '$.tools[?(@.name=='Bash')]' (find specific), '$.servers[*]' (list servers)"
-                        }
-                    },
-                    "required": ["jsonpath"]
-                }
+                "description": _MCP_DISCOVER_DESC.format(tool_count=tool_count, server_count=server_count),
+                "inputSchema": _thaw(_MCP_DISCOVER_SCHEMA)
             },
             {
                 "name": "mcp_call",
-                "description": f"🚀 PROXY META-TOOL: Execute any of the {tool_count} available MCP tools by constructing JSON-RPC calls. This is the universal interface to all hidden tools - you can call ANY tool discovered via mcp_discover without it being loaded into your context.",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "method": {
-                            "type": "string",
-                            "description": "JSON-RPC method to call. For tool execution use 'tools/call'. Other methods: 'tools/list', 'prompts/list', 'resources/list'"
-                        },
-                        "params": {
-                            "type": "object",
-                            "description": "Method parameters. For 'tools/call': {'name': 'tool_name', 'arguments': {...}}. The arguments object contains the actual tool parameters."
-                        }
-                    },
-                    "required": ["method", "params"]
-                }
+                "description": _MCP_CALL_DESC.format(tool_count=tool_count),
+                "inputSchema": _thaw(_MCP_CALL_SCHEMA)
             },
             {
                 "name": "onboarding",
-                "description": "📋 BUILT-IN TOOL: Manage persistent, identity-aware onboarding instructions. This tool lets AI instances leave instructions for future contexts based on identity (project name, user, etc). Perfect for maintaining context across sessions without consuming tokens.",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "identity": {
-                            "type": "string",
-                            "description": "Identity key for onboarding instructions (e.g., 'Claude', 'MyProject', 'WebDev'). Each identity can have separate instructions."
-                        },
-                        "instructions": {
-                            "type": "string",
-                            "description": "Optional: New instructions to store. If omitted, retrieves existing instructions for this identity. Use this to leave notes for future AI sessions."
-                        },
-                        "append": {
-                            "type": "boolean",
-                            "description": "If true, append to existing instructions instead of replacing them entirely",
-                            "default": False
-                        }
-                    },
-                    "required": ["identity"]
-                }
+                "description": _ONBOARDING_DESC,
+                "inputSchema": _thaw(_ONBOARDING_SCHEMA)
             }
         ]
-        
-        return sparse_tools
     
     def get_full_api_documentation(self) -> Dict[str, Any]:
         """
         Generate comprehensive API documentation for AI consumption.
         
         Returns complete server and tool information in structured JSON format.
+        The document is cached until the registry changes; each call returns
+        a fresh top-level dict, but nested values are shared and read-only.
         """
+        if self._api_doc_cache is None:
+            self._api_doc_cache = self._build_api_documentation()
+        return dict(self._api_doc_cache)
+    
+    def _build_api_documentation(self) -> Dict[str, Any]:
+        """Build the document returned by get_full_api_documentation()."""
         servers = self._metadata.get("servers", {})
         
-        # Group tools by server
-        tools_by_server = {}
+        # Index tool name -> first server listing it in its metadata
+        name_to_server: Dict[str, str] = {}
+        for server_name, server_info in servers.items():
+            for t in server_info.get("tools", []):
+                if "name" in t:
+                    name_to_server.setdefault(t["name"], server_name)
+        
+        # Group tools and their names by server in a single pass
+        tools_by_server: Dict[str, List[Dict[str, Any]]] = {}
+        names_by_server: Dict[str, List[str]] = {}
         builtin_tools = []
         
         for tool in self.raw_tool_list:
             tool_name = tool.get("name", "")
             
-            # Check if it's a server-namespaced tool
-            if "::" in tool_name:
-                server_ns = tool_name.split("::")[0]
-                if server_ns not in tools_by_server:
-                    tools_by_server[server_ns] = []
-                tools_by_server[server_ns].append(tool)
-            else:
-                # Check if tool belongs to a specific server based on metadata
-                found_server = None
-                for server_name, server_info in servers.items():
-                    server_tools = server_info.get("tools", [])
-                    if any(t.get("name") == tool_name for t in server_tools):
-                        found_server = server_name
-                        break
-                
-                if found_server:
-                    if found_server not in tools_by_server:
-                        tools_by_server[found_server] = []
-                    tools_by_server[found_server].append(tool)
-                else:
+            # Server-namespaced tool, or one a server lists in its metadata
+            server, sep, _ = tool_name.partition("::")
+            if not sep:
+                server = name_to_server.get(tool_name)
+                if not server:
                     builtin_tools.append(tool)
+                    continue
+            
+            server_tools = tools_by_server.get(server)
+            if server_tools is None:
+                server_tools = tools_by_server[server] = []
+                names_by_server[server] = []
+            server_tools.append(tool)
+            names_by_server[server].append(tool_name)
         
         # Build comprehensive documentation
         api_doc = {
@@ -295,7 +587,7 @@ class ToolRegistry:
                 "tool_schemas": "$.tools[*].inputSchema",
                 "memory_tools": "$.tools[?(@.name =~ /memory|task|pattern|knowledge/i)]",
                 "screen_tools": "$.tools[?(@.name =~ /screen|session/i)]",
-                "find_tool_by_name": "$.tools[?(@.name=='TOOL_NAME')]",
+                "find_tool_by_name": "$.tools_by_name['TOOL_NAME']",
                 "server_capabilities": "$.servers[*].capabilities"
             },
             "sparse_mode_info": {
@@ -316,7 +608,7 @@ class ToolRegistry:
                 "status": server_info.get("status", "unknown"),
                 "tools": server_tools,
                 "tool_count": len(server_tools),
-                "tool_names": [t.get("name", "") for t in server_tools],
+                "tool_names": names_by_server.get(server_name, []),
                 "environment": server_info.get("env", {}),
                 "working_directory": server_info.get("cwd"),
                 "capabilities": self._extract_capabilities(server_tools)
@@ -329,38 +621,41 @@ class ToolRegistry:
         capabilities = set()
         
         for tool in tools:
-            name = tool.get("name", "").lower()
-            desc = tool.get("description", "").lower()
-            
             # Infer capabilities from tool names and descriptions
-            if any(keyword in name for keyword in ["read", "write", "file"]):
-                capabilities.add("file_operations")
-            if any(keyword in name for keyword in ["search", "query", "find"]):
-                capabilities.add("search_operations")
-            if any(keyword in name for keyword in ["web", "http", "url"]):
-                capabilities.add("web_operations")
-            if any(keyword in name for keyword in ["git", "repo", "commit"]):
-                capabilities.add("version_control")
-            if any(keyword in name for keyword in ["memory", "store", "save"]):
-                capabilities.add("data_storage")
-            if any(keyword in name for keyword in ["exec", "run", "command"]):
-                capabilities.add("command_execution")
-            if any(keyword in desc for keyword in ["browser", "scrape", "crawl"]):
-                capabilities.add("web_scraping")
+            name = _lower(tool.get("name", ""))
+            for capability, keywords in _NAME_CAPABILITIES:
+                if capability not in capabilities and any(keyword in name for keyword in keywords):
+                    capabilities.add(capability)
+            
+            # The description is only lowercased while it can still add something
+            if _DESC_CAPABILITY not in capabilities:
+                desc = _lower(tool.get("description", ""))
+                if any(keyword in desc for keyword in _DESC_KEYWORDS):
+                    capabilities.add(_DESC_CAPABILITY)
+            
+            if len(capabilities) == _CAPABILITY_COUNT:
+                break
         
-        return sorted(list(capabilities))
+        return sorted(capabilities)
     
     def set_metadata(self, metadata: Dict[str, Any]):
         """Set metadata about servers and configuration."""
+        servers = metadata.get("servers")
+        if isinstance(servers, dict):
+            metadata["servers"] = {sys.intern(name): info for name, info in servers.items()}
         self._metadata = metadata
+        self._invalidate()
     
     def update_metadata(self, key: str, value: Any):
         """Set specific metadata that can be discovered via JSONPath."""
+        if key == "servers" and isinstance(value, dict):
+            value = {sys.intern(name): info for name, info in value.items()}
         self._metadata[key] = value
+        self._invalidate()
     
     def to_json(self) -> str:
         """Export registry as JSON for debugging."""
-        return json.dumps({
+        return dumps_pretty({
             "tools": self.raw_tool_list,
             "metadata": self._metadata
-        }, indent=2)
\ No newline at end of file
+        })
\ No newline at end of file
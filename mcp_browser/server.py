@@ -8,28 +8,137 @@ Supports both interactive and non-interactive modes.
 import os
 import json
 import asyncio
-import subprocess
-from typing import Optional, Dict, Any, Callable, List
+import itertools
+from functools import lru_cache
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
 from pathlib import Path
 
+from ._json import dumps, dumps_bytes
 from .buffer import JsonRpcBuffer
 from .config import MCPServerConfig
 from .logging_config import get_logger, TRACE
 import logging
 
 
+# Maximum parsed messages waiting for dispatch before the reader blocks
+INBOX_SIZE = 1024
+
+# Answered slots at the head of the pending list before it is trimmed
+PENDING_COMPACT_AT = 1024
+
+# Longest stderr line accepted from a server; stdout is read in chunks
+# and framed by JsonRpcBuffer, so replies of any size are fine
+STREAM_LIMIT = 16 * 1024 * 1024
+
+# Bytes requested per stdout read
+READ_CHUNK = 64 * 1024
+
+# Seconds a server gets to exit by itself once its stdin is closed, before
+# it is sent SIGTERM
+STOP_GRACE = 2.0
+
+# Handshake parameters sent to every server on startup
+INITIALIZE_PARAMS = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {},
+    "clientInfo": {
+        "name": "mcp-browser",
+        "version": "0.1.0"
+    }
+}
+
+# Frames for the fixed startup requests, serialized once; only the id varies
+_INITIALIZE_FRAME = (
+    b'{"jsonrpc": "2.0", "id": %d, "method": "initialize", "params": '
+    + json.dumps(INITIALIZE_PARAMS).replace("%", "%%").encode() + b'}\n'
+)
+_TOOLS_LIST_FRAME = b'{"jsonrpc": "2.0", "id": %d, "method": "tools/list", "params": {}}\n'
+
+# Any other request: filled with the id, encoded method name and params
+_REQUEST_FRAME = b'{"jsonrpc":"2.0","id":%d,"method":%b,"params":%b}\n'
+
+
+class MCPError(Exception):
+    """An error response from an MCP server, keeping its JSON-RPC code."""
+    
+    __slots__ = ("code", "data")
+    
+    def __init__(self, message: str, code: int = -32603, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+    
+    def to_error(self) -> Dict[str, Any]:
+        """Return the JSON-RPC error object for this error."""
+        error = {"code": self.code, "message": str(self)}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+def _static_frame(method: str, params: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    """Return the pre-serialized frame template for a fixed request, if any."""
+    if method == "initialize" and params is INITIALIZE_PARAMS:
+        return _INITIALIZE_FRAME
+    if method == "tools/list" and not params:
+        return _TOOLS_LIST_FRAME
+    return None
+
+
+def _request_parts(method: str, params: Optional[Dict[str, Any]]) -> Tuple[bytes, tuple]:
+    """
+    Serialize a request except for its id.
+    
+    Returns a frame template and the values that follow the id in it;
+    the frame is template % ((request_id,) + values). Raises if params
+    cannot be serialized.
+    """
+    template = _static_frame(method, params)
+    if template is not None:
+        return template, ()
+    # Only params need a full serialization; no request dict is built
+    return _REQUEST_FRAME, (_encode_method(method), dumps_bytes(params) if params else b"{}")
+
+
+@lru_cache(maxsize=256)
+def _encode_method(method: str) -> bytes:
+    """Return the JSON encoding of a method name; there are only a few."""
+    return dumps_bytes(method)
+
+
 class MCPServer:
     """Manages a single MCP server process."""
     
     def __init__(self, config: MCPServerConfig, logger: Optional[logging.Logger] = None):
         self.config = config
         self.logger = logger or get_logger(__name__)
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.buffer = JsonRpcBuffer()
         self._running = False
-        self._message_handlers: List[Callable[[dict], None]] = []
-        self._next_id = 1
-        self._pending_requests: Dict[Union[str, int], asyncio.Future] = {}
+        # Rebuilt on add/remove, so dispatch iterates a snapshot and
+        # handlers may (un)register themselves while being called
+        self._message_handlers: Tuple[Callable[[dict], None], ...] = ()
+        # Our requests are numbered 1, 2, ... but sent with negative ids, so
+        # they never collide with the ids of client requests the proxy
+        # forwards over the same pipe (clients count up from 1 too)
+        self._ids = itertools.count(1)
+        # Our request numbers are dense, so pending requests live in a list:
+        # slot i holds (future, timeout handle) for request number
+        # _pending_base + i (id -(_pending_base + i)), or None once answered.
+        # The handle is cancelled when the response arrives.
+        self._pending_requests: List[Optional[Tuple[asyncio.Future, asyncio.TimerHandle]]] = []
+        self._pending_base = 1
+        self._pending_live = 0
+        # Index of the oldest slot that may still be live
+        self._pending_head = 0
+        # Parsed messages flow reader -> inbox -> dispatcher; the bounded
+        # queue applies backpressure to the reader if dispatch falls behind
+        self._inbox: Optional[asyncio.Queue] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        # Encoded outgoing frames, written out in batches by _write_frames
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
         self._last_error_time: Optional[float] = None
         self._offline_since: Optional[float] = None
         
@@ -59,24 +168,32 @@ class MCPServer:
         
         self.logger.info(f"Starting MCP server: {' '.join(cmd)}")
         
+        # Server stderr is logged as warnings; if those are filtered out
+        # anyway, discard it at the OS level instead of reading it
+        log_stderr = self.logger.isEnabledFor(logging.WARNING)
+        
         try:
-            # Start process
-            self.process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            # Start process; its pipes are serviced by the event loop
+            self.process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE if log_stderr else asyncio.subprocess.DEVNULL,
                 env=env,
-                text=True,
-                bufsize=0  # Unbuffered
+                limit=STREAM_LIMIT
             )
             
             self._running = True
             self._offline_since = None  # Clear offline state
             
             # Start reading outputs
-            asyncio.create_task(self._read_stdout())
-            asyncio.create_task(self._read_stderr())
+            self._inbox = asyncio.Queue(maxsize=INBOX_SIZE)
+            self._reader_task = asyncio.create_task(self._read_stdout())
+            self._dispatch_task = asyncio.create_task(self._dispatch_messages())
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._write_frames())
+            if log_stderr:
+                asyncio.create_task(self._read_stderr())
             
         except Exception as e:
             self.logger.error(f"Failed to start server: {e}")
@@ -87,15 +204,30 @@ class MCPServer:
         """Stop the MCP server process."""
         self._running = False
         
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+            self._dispatch_task = None
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+        
         if self.process:
-            self.process.terminate()
-            try:
-                await asyncio.wait_for(
-                    asyncio.to_thread(self.process.wait),
-                    timeout=5.0
-                )
-            except asyncio.TimeoutError:
-                self.process.kill()
+            if self.process.returncode is None:
+                # Closing stdin first lets the server finish pending work
+                # (such as delayed writes) and exit on its own
+                try:
+                    self.process.stdin.close()
+                    await asyncio.wait_for(self.process.wait(), timeout=STOP_GRACE)
+                except (asyncio.TimeoutError, OSError):
+                    pass
+            if self.process.returncode is None:
+                try:
+                    self.process.terminate()
+                    await asyncio.wait_for(self.process.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    self.process.kill()
+                except ProcessLookupError:
+                    pass
             
             self.process = None
     
@@ -119,100 +251,232 @@ class MCPServer:
         if not self.process:
             raise RuntimeError("MCP server not started")
         
-        request_id = self._next_id
-        self._next_id += 1
+        # Serialize first: an id is only taken once its slot is certain to
+        # be appended, so ids and slots stay in step
+        template, values = _request_parts(method, params)
+        request_id, future = self._register(method)
+        frame = template % ((request_id,) + values)
+        
+        # Requests queued in the same tick go out in one write
+        self._write_queue.put_nowait(frame)
+        
+        if self.logger.isEnabledFor(TRACE):
+            self.logger.log(TRACE, ">>> %s", frame.decode().strip())
+        
+        return await future
+    
+    def send_requests(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[asyncio.Future]:
+        """
+        Send several JSON-RPC requests in one write without waiting.
+        
+        Args:
+            calls: (method, params) pairs, sent in order
+            
+        Returns:
+            One future per call, resolving to its result or raising on
+            error; await them together with asyncio.gather()
+        """
+        if not self.process:
+            raise RuntimeError("MCP server not started")
         
-        request = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-            "params": params or {}
-        }
+        # All calls are serialized before any is registered, so a bad
+        # params dict fails the batch without leaving orphaned requests
+        parts = [_request_parts(method, params) for method, params in calls]
         
-        # Create future for response
-        future = asyncio.Future()
-        self._pending_requests[request_id] = future
+        futures = []
+        frames = []
+        for (method, _), (template, values) in zip(calls, parts):
+            request_id, future = self._register(method)
+            frames.append(template % ((request_id,) + values))
+            futures.append(future)
         
-        # Send request
-        request_str = json.dumps(request) + "\n"
-        self.process.stdin.write(request_str)
-        self.process.stdin.flush()
+        if frames:
+            data = b"".join(frames)
+            self._write_queue.put_nowait(data)
+            if self.logger.isEnabledFor(TRACE):
+                self.logger.log(TRACE, ">>> %s", data.decode().strip())
         
-        self.logger.log(TRACE, f">>> {request_str.strip()}")
+        return futures
+    
+    def _register(self, method: str) -> Tuple[int, asyncio.Future]:
+        """Allocate an id for a request and add its pending slot."""
+        request_id = -next(self._ids)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
         
-        # Wait for response with appropriate timeout
+        # Fail the future on timeout with a plain timer instead of wrapping
+        # the await in wait_for(), which costs an extra task per request
         timeout = 3.0 if method == "initialize" or method == "tools/list" else 30.0
+        handle = loop.call_later(timeout, self._expire, request_id, method, timeout)
+        self._pending_requests.append((future, handle))
+        self._pending_live += 1
+        return request_id, future
+    
+    def _expire(self, request_id: int, method: str, timeout: float):
+        """Fail a request whose response did not arrive in time."""
+        pending = self._take_pending(request_id)
+        if pending is None:
+            return
         
-        try:
-            response = await asyncio.wait_for(future, timeout=timeout)
-            return response
-        except asyncio.TimeoutError:
-            del self._pending_requests[request_id]
-            self.logger.error(f"Timeout waiting for response to {method} (timeout={timeout}s)")
-            self._mark_offline()
-            raise TimeoutError(f"No response for request {request_id}")
+        future = pending[0]
+        if future.done():
+            # Caller gave up (cancelled) before the timeout
+            return
+        
+        self.logger.error(f"Timeout waiting for response to {method} (timeout={timeout}s)")
+        self._mark_offline()
+        future.set_exception(TimeoutError(f"No response for request {request_id}"))
+    
+    def _take_pending(self, request_id: Any) -> Optional[Tuple[asyncio.Future, asyncio.TimerHandle]]:
+        """Remove and return the pending entry for request_id, if any."""
+        # Only ints can be ours; bool is excluded with the exact type check.
+        # A string id such as "12" belongs to a forwarded client request,
+        # never to ours, so it is not converted.
+        if type(request_id) is not int:
+            return None
+        
+        slots = self._pending_requests
+        index = -request_id - self._pending_base
+        if index < 0 or index >= len(slots):
+            return None
+        
+        pending = slots[index]
+        if pending is None:
+            return None
+        slots[index] = None
+        self._pending_live -= 1
+        
+        if not self._pending_live:
+            # Nothing in flight: restart the list at the next request, which
+            # is the one after the last slot (ids are appended as allocated)
+            self._pending_base += len(slots)
+            slots.clear()
+            self._pending_head = 0
+        elif index == self._pending_head:
+            head = index + 1
+            while slots[head] is None:
+                head += 1
+            if head >= PENDING_COMPACT_AT and head * 2 >= len(slots):
+                # Drop the answered prefix left behind a slow request
+                del slots[:head]
+                self._pending_base += head
+                head = 0
+            self._pending_head = head
+        
+        return pending
     
-    def send_raw(self, message: str):
-        """Send raw message to MCP server (for pass-through)."""
+    async def _write_frames(self):
+        """Write queued frames, batching everything already queued."""
+        queue = self._write_queue
+        while True:
+            frames = [await queue.get()]
+            while not queue.empty():
+                frames.append(queue.get_nowait())
+            
+            try:
+                self.process.stdin.write(b"".join(frames))
+                await self.process.stdin.drain()
+            except Exception as e:
+                # Pending requests will fail through their timeouts
+                self.logger.error(f"Error writing to server: {e}")
+                self._mark_offline()
+                break
+    
+    def send_raw(self, message: Union[str, bytes]):
+        """
+        Send raw message to MCP server (for pass-through).
+        
+        Already-encoded bytes are queued as they are; str is UTF-8 encoded.
+        """
         if not self.process:
             raise RuntimeError("MCP server not started")
         
-        if not message.endswith('\n'):
-            message += '\n'
+        if isinstance(message, str):
+            message = message.encode()
+        if not message.endswith(b"\n"):
+            message += b"\n"
         
-        self.logger.log(TRACE, f">>> {message.strip()}")
+        if self.logger.isEnabledFor(TRACE):
+            self.logger.log(TRACE, ">>> %s", message.decode().strip())
         
-        self.process.stdin.write(message)
-        self.process.stdin.flush()
+        # Shares the writer task with send_request, so pass-through and
+        # internal frames go out together and respect drain() backpressure
+        self._write_queue.put_nowait(message)
     
     def add_message_handler(self, handler: Callable[[dict], None]):
-        """Add a handler for incoming messages."""
-        self._message_handlers.append(handler)
+        """Add a handler for incoming messages other than replies to our own requests."""
+        self._message_handlers += (handler,)
+    
+    def remove_message_handler(self, handler: Callable[[dict], None]):
+        """Remove a handler added with add_message_handler, if present."""
+        self._message_handlers = tuple(h for h in self._message_handlers if h != handler)
     
     async def _read_stdout(self):
         """Read and process stdout from MCP server."""
         while self._running and self.process:
             try:
-                line = await asyncio.to_thread(self.process.stdout.readline)
-                if not line:
+                # Take whatever has arrived; one read can carry many messages
+                chunk = await self.process.stdout.read(READ_CHUNK)
+                if not chunk:
                     break
                 
-                messages = self.buffer.append(line)
-                for msg in messages:
-                    await self._handle_message(msg)
+                for msg in self.buffer.append(chunk):
+                    await self._inbox.put(msg)
                     
             except Exception as e:
                 self.logger.error(f"Error reading stdout: {e}")
                 self._mark_offline()
                 break
     
+    async def _dispatch_messages(self):
+        """Drain parsed messages from the inbox and dispatch them."""
+        inbox = self._inbox
+        while True:
+            message = await inbox.get()
+            await self._handle_message(message)
+            # Handle everything already queued without yielding
+            while not inbox.empty():
+                await self._handle_message(inbox.get_nowait())
+    
     async def _read_stderr(self):
         """Read and log stderr from MCP server."""
-        while self._running and self.process:
-            try:
-                line = await asyncio.to_thread(self.process.stderr.readline)
-                if not line:
+        warning = self.logger.warning
+        try:
+            async for line in self.process.stderr:
+                line = line.strip()
+                if line:
+                    warning("stderr: %s", line.decode(errors="replace"))
+                if not self._running:
                     break
-                
-                if line.strip():
-                    self.logger.warning(f"stderr: {line.strip()}")
-                    
-            except Exception:
-                break
+        except Exception:
+            pass
     
     async def _handle_message(self, message: dict):
         """Handle an incoming JSON-RPC message."""
-        self.logger.log(TRACE, f"<<< {json.dumps(message)}")
+        if self.logger.isEnabledFor(TRACE):
+            self.logger.log(TRACE, "<<< %s", dumps(message))
         
         # Check if it's a response to a pending request
-        msg_id = message.get("id")
-        if msg_id in self._pending_requests:
-            future = self._pending_requests.pop(msg_id)
+        pending = self._take_pending(message.get("id"))
+        if pending is not None:
+            future, handle = pending
+            handle.cancel()
             
-            if "error" in message:
-                future.set_exception(Exception(message["error"].get("message", "Unknown error")))
+            if future.done():
+                # Caller gave up (cancelled) before the reply arrived
+                pass
+            elif "error" in message:
+                error = message["error"]
+                if type(error) is dict:
+                    future.set_exception(MCPError(
+                        error.get("message", "Unknown error"), error.get("code", -32603), error.get("data")
+                    ))
+                else:
+                    future.set_exception(MCPError(str(error)))
             else:
                 future.set_result(message.get("result"))
+            # The reply is ours alone; handlers never see it
+            return
         
         # Call registered handlers
         for handler in self._message_handlers:
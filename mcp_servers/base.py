@@ -5,26 +5,81 @@ Provides a foundation for building MCP servers with standard
 JSON-RPC handling and tool management.
 """
 
+import os
 import sys
 import json
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
-from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Callable, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class BaseMCPServer(ABC):
-    """Base class for MCP servers."""
+# Per-message tracing on stderr; set MCP_DEBUG=1 in the server's environment
+DEBUG = bool(os.environ.get("MCP_DEBUG"))
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a JSON message, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let json accept what orjson rejects (NaN, huge ints) or raise
+            pass
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a JSON message to UTF-8 bytes, with orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode()
+
+
+def _error_response(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    """Build a JSON-RPC error response."""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {
+            "code": code,
+            "message": message
+        }
+    }
+
+
+# Replies to lines that are not valid JSON, or not a request object, so
+# carry no id; they never change
+_PARSE_ERROR_FRAME = _dumps(_error_response(None, -32700, "Parse error")) + b"\n"
+_INVALID_REQUEST_FRAME = _dumps(_error_response(None, -32600, "Invalid Request")) + b"\n"
+
+
+class BaseMCPServer:
+    """
+    Base class for MCP servers.
+    
+    Tools registered with a handler are called directly; subclasses
+    override handle_tool_call() for the rest.
+    """
     
     def __init__(self, name: str, version: str = "1.0.0"):
         self.name = name
         self.version = version
         self.tools: Dict[str, Dict[str, Any]] = {}
         self._running = False
+        # Results of initialize and tools/list, which only change when a
+        # tool is registered, and their serialized frames split around the id
+        self._static_results: Dict[str, Dict[str, Any]] = {}
+        self._static_frames: Dict[str, Tuple[bytes, bytes]] = {}
         
-    @abstractmethod
     async def handle_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle a tool call. Must be implemented by subclasses."""
-        pass
+        """Handle a call to a tool registered without a handler."""
+        raise NotImplementedError(f"Tool '{tool_name}' has no handler")
     
     def register_tool(self, name: str, description: str, input_schema: Dict[str, Any], 
                      handler: Optional[Callable] = None):
@@ -35,6 +90,52 @@ class BaseMCPServer(ABC):
             "inputSchema": input_schema,
             "handler": handler
         }
+        self._static_results.pop("tools/list", None)
+        self._static_frames.pop("tools/list", None)
+    
+    def _static_result(self, method: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for initialize or tools/list, else None."""
+        result = self._static_results.get(method)
+        if result is not None:
+            return result
+        
+        if method == "initialize":
+            result = {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {
+                    "tools": {}
+                },
+                "serverInfo": {
+                    "name": self.name,
+                    "version": self.version
+                }
+            }
+        elif method == "tools/list":
+            # Handlers are server-side only and not serializable
+            result = {
+                "tools": [
+                    {key: value for key, value in tool.items() if key != "handler"}
+                    for tool in self.tools.values()
+                ]
+            }
+        else:
+            return None
+        
+        self._static_results[method] = result
+        return result
+    
+    def _static_response(self, method: str, request_id: Any) -> Optional[bytes]:
+        """Return the serialized response for initialize or tools/list, else None."""
+        frame = self._static_frames.get(method)
+        if frame is None:
+            result = self._static_result(method)
+            if result is None:
+                return None
+            frame = self._static_frames[method] = (
+                b'{"jsonrpc": "2.0", "id": ',
+                b', "result": ' + _dumps(result) + b'}\n'
+            )
+        return frame[0] + _dumps(request_id) + frame[1]
     
     async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle a JSON-RPC request."""
@@ -43,29 +144,11 @@ class BaseMCPServer(ABC):
         request_id = request.get("id")
         
         try:
-            if method == "initialize":
+            if method == "initialize" or method == "tools/list":
                 return {
                     "jsonrpc": "2.0",
                     "id": request_id,
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {
-                            "tools": {}
-                        },
-                        "serverInfo": {
-                            "name": self.name,
-                            "version": self.version
-                        }
-                    }
-                }
-            
-            elif method == "tools/list":
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "tools": list(self.tools.values())
-                    }
+                    "result": self._static_result(method)
                 }
             
             elif method == "tools/call":
@@ -75,7 +158,7 @@ class BaseMCPServer(ABC):
                 if tool_name not in self.tools:
                     raise Exception(f"Tool '{tool_name}' not found")
                 
-                # Use registered handler if available, otherwise use abstract method
+                # Use registered handler if available, otherwise handle_tool_call()
                 tool_info = self.tools[tool_name]
                 if tool_info.get("handler"):
                     result = await tool_info["handler"](arguments)
@@ -92,21 +175,18 @@ class BaseMCPServer(ABC):
                 raise Exception(f"Method '{method}' not found")
                 
         except Exception as e:
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32603,
-                    "message": str(e)
-                }
-            }
+            return _error_response(request_id, -32603, str(e))
     
     async def run(self):
         """Run the MCP server, reading from stdin and writing to stdout."""
         self._running = True
+        # Responses go straight to the stdout fd, one os.write() each;
+        # nothing else in the server writes to stdout
+        sys.stdout.flush()
+        self._out_fd = sys.stdout.fileno()
         
-        # Log server startup
-        print(f"DEBUG: {self.name} server starting", file=sys.stderr, flush=True)
+        if DEBUG:
+            print(f"DEBUG: {self.name} server starting", file=sys.stderr, flush=True)
         
         # Use asyncio for stdin reading
         loop = asyncio.get_event_loop()
@@ -131,57 +211,70 @@ class BaseMCPServer(ABC):
                 
                 if not line:
                     # Empty bytes means EOF
-                    print(f"DEBUG: {self.name} detected EOF on stdin", file=sys.stderr, flush=True)
+                    if DEBUG:
+                        print(f"DEBUG: {self.name} detected EOF on stdin", file=sys.stderr, flush=True)
                     break
                 
-                # Decode and process line
-                line_str = line.decode('utf-8').strip()
-                if not line_str:
+                # Parse the raw line; JSON decoding handles the UTF-8
+                line = line.strip()
+                if not line:
                     continue
                 
-                print(f"DEBUG: {self.name} received: {line_str}", file=sys.stderr, flush=True)
+                if DEBUG:
+                    print(f"DEBUG: {self.name} received: {line.decode('utf-8', 'replace')}", file=sys.stderr, flush=True)
                 
                 try:
-                    request = json.loads(line_str)
-                    response = await self.handle_request(request)
-                    response_str = json.dumps(response)
-                    print(f"DEBUG: {self.name} sending: {response_str}", file=sys.stderr, flush=True)
-                    print(response_str, flush=True)
-                except json.JSONDecodeError as e:
+                    request = _loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
                     print(f"ERROR: {self.name} JSON decode error: {e}", file=sys.stderr, flush=True)
-                    error_response = {
-                        "jsonrpc": "2.0",
-                        "id": None,
-                        "error": {
-                            "code": -32700,
-                            "message": "Parse error"
-                        }
-                    }
-                    print(json.dumps(error_response), flush=True)
-                except Exception as e:
-                    print(f"ERROR: {self.name} request handling error: {e}", file=sys.stderr, flush=True)
-                    error_response = {
-                        "jsonrpc": "2.0",
-                        "id": None,
-                        "error": {
-                            "code": -32603,
-                            "message": str(e)
-                        }
-                    }
-                    print(json.dumps(error_response), flush=True)
+                    self._write(_PARSE_ERROR_FRAME)
+                    continue
+                
+                if type(request) is not dict:
+                    self._write(_INVALID_REQUEST_FRAME)
+                    continue
+                
+                # Handshake and tool listing replies are pre-serialized
+                frame = self._static_response(request.get("method"), request.get("id"))
+                if frame is None:
+                    # handle_request turns tool and method errors into error
+                    # responses itself; only a result that cannot be
+                    # serialized is left to report here
+                    response = await self.handle_request(request)
+                    try:
+                        frame = _dumps(response) + b"\n"
+                    except (TypeError, ValueError) as e:
+                        print(f"ERROR: {self.name} cannot serialize response: {e}", file=sys.stderr, flush=True)
+                        frame = _dumps(_error_response(request.get("id"), -32603, str(e))) + b"\n"
+                
+                if DEBUG:
+                    print(f"DEBUG: {self.name} sending: {frame.decode().strip()}", file=sys.stderr, flush=True)
+                self._write(frame)
                     
             except asyncio.CancelledError:
-                print(f"DEBUG: {self.name} cancelled", file=sys.stderr, flush=True)
+                if DEBUG:
+                    print(f"DEBUG: {self.name} cancelled", file=sys.stderr, flush=True)
                 break
             except KeyboardInterrupt:
-                print(f"DEBUG: {self.name} interrupted", file=sys.stderr, flush=True)
+                if DEBUG:
+                    print(f"DEBUG: {self.name} interrupted", file=sys.stderr, flush=True)
                 break
             except Exception as e:
                 print(f"ERROR: {self.name} unexpected error: {e}", file=sys.stderr, flush=True)
                 # Continue running despite errors
                 await asyncio.sleep(0.1)
         
-        print(f"DEBUG: {self.name} server exiting", file=sys.stderr, flush=True)
+        if DEBUG:
+            print(f"DEBUG: {self.name} server exiting", file=sys.stderr, flush=True)
+    
+    def _write(self, data: bytes):
+        """Write one serialized, newline-terminated message to stdout."""
+        written = os.write(self._out_fd, data)
+        if written < len(data):
+            # Short write on a large message; send the rest
+            view = memoryview(data)[written:]
+            while view:
+                view = view[os.write(self._out_fd, view):]
     
     def content_text(self, text: str) -> Dict[str, Any]:
         """Helper to create text content response."""
@@ -9,17 +9,106 @@ and knowledge across sessions.
 import os
 import sys
 import json
+import time
+import signal
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple, Callable, Awaitable
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from uuid import uuid4
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 from base import BaseMCPServer
 
+# Seconds to wait for further changes before writing modified data files,
+# so a burst of tool calls costs one write per file
+SAVE_DELAY = 0.05
+
+# Changes are appended to a log next to each data file (tasks.json ->
+# tasks.log) and folded back into the file once the log outgrows both
+# twice the file's size and this many bytes
+COMPACT_MIN_LOG = 64 * 1024
+
+# Seconds a formatted timestamp is reused for, so a burst of changes
+# formats the current time once
+TIMESTAMP_REUSE = 0.01
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also takes NaN and huge ints, or raises the same error
+            pass
+    return json.loads(data)
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, indented by two spaces if pretty."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2 if pretty else None).encode()
+
+
+# Queued cmem syncs beyond this drop the oldest ones
+CMEM_QUEUE_SIZE = 1024
+
+# Leading id characters shown to users and indexed for lookups
+ID_PREFIX = 8
+
+
+def _index_prefixes(ids) -> Dict[str, Optional[str]]:
+    """Map each id's first ID_PREFIX characters to it; None where shared."""
+    index: Dict[str, Optional[str]] = {}
+    for item_id in ids:
+        _add_prefix(index, item_id)
+    return index
+
+
+def _add_prefix(index: Dict[str, Optional[str]], item_id: str):
+    """Add an id to a prefix index."""
+    prefix = item_id[:ID_PREFIX]
+    if prefix in index:
+        index[prefix] = None
+    else:
+        index[prefix] = item_id
+
+
+def _find_id(items: Dict[str, Any], index: Dict[str, Optional[str]], given: str) -> Optional[str]:
+    """Resolve a full or partial id to the first id in items it starts."""
+    if given in items:
+        return given
+    if len(given) >= ID_PREFIX:
+        full_id = index.get(given[:ID_PREFIX], "")
+        if full_id is not None:
+            return full_id if full_id.startswith(given) else None
+    # Shorter than the indexed prefix, or a shared prefix
+    for item_id in items:
+        if item_id.startswith(given):
+            return item_id
+    return None
+
+
+# Data files of a project, by the attribute that holds their contents
+DATA_FILES = {
+    "tasks": "tasks.json",
+    "decisions": "decisions.json",
+    "patterns": "patterns.json",
+    "knowledge": "knowledge.json",
+}
+
 
 @dataclass
 class Task:
@@ -53,6 +142,16 @@ class Pattern:
     solution: Optional[str] = None
 
 
+def _to_record(item: Any) -> Dict[str, Any]:
+    """
+    Return a Task, Decision or Pattern as the dict stored for it.
+    
+    A shallow copy of the instance's fields; asdict() would also deep-copy
+    every value, at many times the cost.
+    """
+    return dict(vars(item))
+
+
 class MemoryServer(BaseMCPServer):
     """MCP server for memory and context management with cmem integration."""
     
@@ -61,6 +160,24 @@ class MemoryServer(BaseMCPServer):
         self.memory_dir = Path.home() / ".mcp-memory"
         self.memory_dir.mkdir(exist_ok=True)
         self.current_project = identity
+        # Full path of the cmem executable, found by _setup_cmem_integration
+        self._cmem_path: Optional[str] = None
+        # cmem syncs run in the background, one at a time, so tool calls do
+        # not wait for them; both are created on first use
+        self._cmem_queue: Optional[asyncio.Queue] = None
+        self._cmem_worker: Optional[asyncio.Task] = None
+        # Data files changed since the last write, by path: their contents
+        # and the log lines not yet appended. Written by _flush_later()
+        # or flush().
+        self._dirty: Dict[Path, Tuple[Any, List[bytes]]] = {}
+        # (data file, log) sizes in bytes as last read or written, by path
+        self._file_sizes: Dict[Path, Tuple[int, int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # Keeps write-outs from overlapping while one runs in a thread;
+        # created on first use, inside the event loop
+        self._write_lock: Optional[asyncio.Lock] = None
+        # (monotonic time, ISO timestamp) last returned by _now_iso()
+        self._now_iso_cache: Tuple[float, str] = (float("-inf"), "")
         self.cmem_integration = self._setup_cmem_integration()
         self._register_tools()
         self._load_memory()
@@ -80,7 +197,8 @@ class MemoryServer(BaseMCPServer):
                     "assignee": {"type": "string", "description": "Optional assignee"}
                 },
                 "required": ["content"]
-            }
+            },
+            handler=self._task_add
         )
         
         self.register_tool(
@@ -91,7 +209,8 @@ class MemoryServer(BaseMCPServer):
                 "properties": {
                     "status": {"type": "string", "enum": ["pending", "in_progress", "completed"]}
                 }
-            }
+            },
+            handler=self._task_list
         )
         
         self.register_tool(
@@ -104,7 +223,8 @@ class MemoryServer(BaseMCPServer):
                     "status": {"type": "string", "enum": ["pending", "in_progress", "completed"]}
                 },
                 "required": ["task_id", "status"]
-            }
+            },
+            handler=self._task_update
         )
         
         # Decision tracking
@@ -119,7 +239,8 @@ class MemoryServer(BaseMCPServer):
                     "alternatives": {"type": "array", "items": {"type": "string"}}
                 },
                 "required": ["choice", "reasoning", "alternatives"]
-            }
+            },
+            handler=self._decision_add
         )
         
         # Pattern management
@@ -135,7 +256,8 @@ class MemoryServer(BaseMCPServer):
                     "effectiveness": {"type": "number", "minimum": 0, "maximum": 1}
                 },
                 "required": ["pattern", "description"]
-            }
+            },
+            handler=self._pattern_add
         )
         
         self.register_tool(
@@ -148,7 +270,8 @@ class MemoryServer(BaseMCPServer):
                     "solution": {"type": "string"}
                 },
                 "required": ["pattern_id", "solution"]
-            }
+            },
+            handler=self._pattern_resolve
         )
         
         # Knowledge management
@@ -163,7 +286,8 @@ class MemoryServer(BaseMCPServer):
                     "category": {"type": "string"}
                 },
                 "required": ["key", "value"]
-            }
+            },
+            handler=self._knowledge_add
         )
         
         self.register_tool(
@@ -175,7 +299,8 @@ class MemoryServer(BaseMCPServer):
                     "key": {"type": "string"},
                     "category": {"type": "string"}
                 }
-            }
+            },
+            handler=self._knowledge_get
         )
         
         # Project management
@@ -188,7 +313,8 @@ class MemoryServer(BaseMCPServer):
                     "project": {"type": "string"}
                 },
                 "required": ["project"]
-            }
+            },
+            handler=self._project_switch
         )
         
         # Summary and stats
@@ -198,28 +324,150 @@ class MemoryServer(BaseMCPServer):
             input_schema={
                 "type": "object",
                 "properties": {}
-            }
+            },
+            handler=self._memory_summary
         )
     
     def _load_memory(self):
-        """Load memory for current project."""
+        """Switch to the current project; its data files are read on first use."""
         self.project_dir = self.memory_dir / self.current_project
         self.project_dir.mkdir(exist_ok=True)
+        # None until read by the property of the same name or _load()
+        self._tasks: Optional[Dict[str, Any]] = None
+        self._decisions: Optional[Dict[str, Any]] = None
+        self._patterns: Optional[Dict[str, Any]] = None
+        self._knowledge: Optional[Dict[str, Any]] = None
+    
+    # The indexes and counts derived from a data file are built when it is
+    # read, so use its property (or await _load()) before them
+    
+    @property
+    def tasks(self) -> Dict[str, Any]:
+        """The current project's tasks by id."""
+        if self._tasks is None:
+            self._read_now("tasks")
+        return self._tasks
+    
+    @property
+    def decisions(self) -> Dict[str, Any]:
+        """The current project's decisions by id."""
+        if self._decisions is None:
+            self._read_now("decisions")
+        return self._decisions
+    
+    @property
+    def patterns(self) -> Dict[str, Any]:
+        """The current project's patterns by id."""
+        if self._patterns is None:
+            self._read_now("patterns")
+        return self._patterns
+    
+    @property
+    def knowledge(self) -> Dict[str, Any]:
+        """The current project's knowledge items by category and key."""
+        if self._knowledge is None:
+            self._read_now("knowledge")
+        return self._knowledge
+    
+    def _read_now(self, name: str):
+        """Read the named data file on the calling thread."""
+        filepath = self.project_dir / DATA_FILES[name]
+        self._set_data(name, filepath, self._read_data_file(filepath))
+    
+    async def _load(self, *names: str):
+        """Read those of the named data files not yet read, in a worker thread."""
+        loop = asyncio.get_running_loop()
+        for name in names:
+            if getattr(self, "_" + name) is not None:
+                continue
+            filepath = self.project_dir / DATA_FILES[name]
+            loaded = await loop.run_in_executor(None, self._read_data_file, filepath)
+            # Another call may have read it meanwhile, or switched projects
+            if getattr(self, "_" + name) is None and filepath.parent == self.project_dir:
+                self._set_data(name, filepath, loaded)
+    
+    @staticmethod
+    def _read_data_file(filepath: Path) -> Tuple[Dict[str, Any], Tuple[int, int]]:
+        """
+        Read a data file and replay its log; no server state is touched.
+        
+        Returns:
+            The contents and the (data file, log) sizes in bytes
+        """
+        log_path = filepath.with_suffix(".log")
+        content = {}
+        file_size = log_size = 0
         
-        # Load data files
-        self.tasks = self._load_json("tasks.json", {})
-        self.decisions = self._load_json("decisions.json", {})
-        self.patterns = self._load_json("patterns.json", {})
-        self.knowledge = self._load_json("knowledge.json", {})
+        if filepath.exists():
+            raw = filepath.read_bytes()
+            content = _loads(raw)
+            file_size = len(raw)
+        
+        if log_path.exists():
+            with open(log_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Torn final line from an interrupted append; cut
+                        # it off so the next append starts a fresh line
+                        os.truncate(log_path, log_size)
+                        break
+                    log_size += len(line)
+                    try:
+                        entry = _loads(line)
+                    except ValueError:
+                        continue
+                    *parents, key = entry["key"]
+                    node = content
+                    for parent in parents:
+                        node = node.setdefault(parent, {})
+                    node[key] = entry["value"]
+        
+        return content, (file_size, log_size)
+    
+    def _set_data(self, name: str, filepath: Path, loaded: Tuple[Dict[str, Any], Tuple[int, int]]):
+        """Make a data file read by _read_data_file() the current project's."""
+        content, self._file_sizes[filepath] = loaded
+        setattr(self, "_" + name, content)
+        
+        if name == "tasks":
+            # Short id prefixes -> full ids, for task_update
+            self._task_prefixes = _index_prefixes(content)
+            # Status -> ids of the tasks in it, for task_list with a filter and
+            # memory_summary. Dicts with None values keep ids ordered like
+            # self.tasks; a status in _unsorted_statuses got a task out of
+            # that order and is re-sorted by _task_order when next listed.
+            self._tasks_by_status: Dict[str, Dict[str, None]] = {}
+            self._unsorted_statuses: Set[str] = set()
+            # Task id -> position in self.tasks
+            self._task_order: Dict[str, int] = {}
+            for position, (task_id, task) in enumerate(content.items()):
+                self._tasks_by_status.setdefault(task["status"], {})[task_id] = None
+                self._task_order[task_id] = position
+        elif name == "patterns":
+            # Short id prefixes -> full ids, for pattern_resolve
+            self._pattern_prefixes = _index_prefixes(content)
+            # Kept current by pattern_resolve, for memory_summary
+            self._resolved_pattern_count = sum(1 for pattern in content.values() if pattern["resolved"])
+        elif name == "knowledge":
+            # Kept current by knowledge_add, for memory_summary
+            self._knowledge_item_count = sum(len(items) for items in content.values())
+            # Knowledge key -> categories holding it, for knowledge_get by key
+            self._knowledge_keys: Dict[str, List[str]] = {}
+            for category, items in content.items():
+                for key in items:
+                    self._knowledge_keys.setdefault(key, []).append(category)
     
     def _setup_cmem_integration(self) -> bool:
         """Setup integration with cmem by creating identity-specific directories."""
         try:
             # Check if cmem is available
+            import shutil
             import subprocess
-            result = subprocess.run(['cmem', 'stats'], capture_output=True, text=True, timeout=5)
+            cmem_path = shutil.which('cmem') or 'cmem'
+            result = subprocess.run([cmem_path, 'stats'], capture_output=True, text=True, timeout=5)
             if result.returncode != 0:
                 return False
+            self._cmem_path = cmem_path
             
             # Create identity-specific directory
             identity_dir = self.memory_dir / self.current_project
@@ -259,72 +507,184 @@ class MemoryServer(BaseMCPServer):
         with open(bridge_dir / "info.json", 'w') as f:
             json.dump(bridge_info, f, indent=2)
     
-    def _load_json(self, filename: str, default: Any) -> Any:
-        """Load JSON file or return default."""
+    def _save_entry(self, filename: str, data: Dict[str, Any], key: List[str]):
+        """
+        Schedule a changed entry of a data file to be saved.
+        
+        Args:
+            filename: Data file of the current project
+            data: The file's full contents
+            key: Path to the changed entry within data
+        """
+        value = data
+        for part in key:
+            value = value[part]
+        
         filepath = self.project_dir / filename
-        if filepath.exists():
-            with open(filepath) as f:
-                return json.load(f)
-        return default
+        pending = self._dirty.get(filepath)
+        if pending is None:
+            pending = self._dirty[filepath] = (data, [])
+        pending[1].append(_dumps({"key": key, "value": value}) + b"\n")
+        
+        if self._flush_task is not None:
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not serving requests; nothing would run a delayed write
+            self._write_files(self._serialize_dirty())
+            return
+        self._flush_task = loop.create_task(self._flush_later())
     
-    def _save_json(self, filename: str, data: Any):
-        """Save data to JSON file."""
-        filepath = self.project_dir / filename
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
-    
-    async def handle_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle memory tool calls."""
-        
-        if tool_name == "task_add":
-            return await self._task_add(arguments)
-        elif tool_name == "task_list":
-            return await self._task_list(arguments)
-        elif tool_name == "task_update":
-            return await self._task_update(arguments)
-        elif tool_name == "decision_add":
-            return await self._decision_add(arguments)
-        elif tool_name == "pattern_add":
-            return await self._pattern_add(arguments)
-        elif tool_name == "pattern_resolve":
-            return await self._pattern_resolve(arguments)
-        elif tool_name == "knowledge_add":
-            return await self._knowledge_add(arguments)
-        elif tool_name == "knowledge_get":
-            return await self._knowledge_get(arguments)
-        elif tool_name == "project_switch":
-            return await self._project_switch(arguments)
-        elif tool_name == "memory_summary":
-            return await self._memory_summary()
-        else:
-            raise Exception(f"Unknown tool: {tool_name}")
+    async def _flush_later(self):
+        """Write all modified data files once SAVE_DELAY has passed."""
+        await asyncio.sleep(SAVE_DELAY)
+        self._flush_task = None
+        await self._write_dirty()
+    
+    async def flush(self):
+        """Write all modified data files now."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._write_dirty()
+    
+    async def _write_dirty(self):
+        """Write every modified data file without blocking the event loop."""
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            # Serialized here, as the data may change while the thread writes
+            files = self._serialize_dirty()
+            if files:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._write_files, files)
+    
+    def _serialize_dirty(self) -> List[Tuple[Path, bool, bytes]]:
+        """
+        Take the modified data files and return what to write for each.
+        
+        Returns:
+            (data file, compact, text) triples: with compact set, text is
+            the new data file and its log is emptied; otherwise text is
+            appended to the log
+        """
+        dirty, self._dirty = self._dirty, {}
+        files = []
+        for filepath, (data, lines) in dirty.items():
+            file_size, log_size = self._file_sizes.get(filepath, (0, 0))
+            text = b"".join(lines)
+            log_size += len(text)
+            
+            if log_size > COMPACT_MIN_LOG and log_size > 2 * file_size:
+                text = _dumps(data, pretty=True)
+                self._file_sizes[filepath] = (len(text), 0)
+                files.append((filepath, True, text))
+            else:
+                self._file_sizes[filepath] = (file_size, log_size)
+                files.append((filepath, False, text))
+        return files
+    
+    @staticmethod
+    def _write_files(files: List[Tuple[Path, bool, bytes]]):
+        """Apply the writes returned by _serialize_dirty()."""
+        for filepath, compact, text in files:
+            log_path = filepath.with_suffix(".log")
+            if not compact:
+                with open(log_path, 'ab') as f:
+                    f.write(text)
+                continue
+            
+            # Replace the data file atomically, then drop the log; should
+            # that fail, replaying the log over the new file is harmless
+            tmp_path = filepath.with_name(filepath.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(text)
+            os.replace(tmp_path, filepath)
+            try:
+                os.remove(log_path)
+            except FileNotFoundError:
+                pass
+    
+    async def run(self):
+        """Serve requests, then finish pending writes and cmem syncs."""
+        loop = asyncio.get_running_loop()
+        serving = asyncio.ensure_future(super().run())
+        terminated = False
+        
+        def terminate():
+            nonlocal terminated
+            terminated = True
+            serving.cancel()
+        
+        # SIGTERM ends serving like EOF on stdin does, so changes still
+        # waiting for SAVE_DELAY are written before the process exits
+        try:
+            loop.add_signal_handler(signal.SIGTERM, terminate)
+        except (NotImplementedError, RuntimeError):
+            # No signal handlers on Windows event loops
+            pass
+        
+        try:
+            await serving
+        except asyncio.CancelledError:
+            if not terminated:
+                raise
+        finally:
+            try:
+                loop.remove_signal_handler(signal.SIGTERM)
+            except (NotImplementedError, RuntimeError):
+                pass
+            await self.flush()
+            await self._cmem_idle()
+    
+    def _now_iso(self) -> str:
+        """Return the current local time in ISO format, at most TIMESTAMP_REUSE old."""
+        now = time.monotonic()
+        if now - self._now_iso_cache[0] > TIMESTAMP_REUSE:
+            self._now_iso_cache = (now, datetime.now().isoformat())
+        return self._now_iso_cache[1]
     
     async def _task_add(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Add a new task."""
+        await self._load("tasks")
         task = Task(
-            id=str(uuid4()),
+            id=uuid4().hex,
             content=args["content"],
             priority=args.get("priority", "medium"),
-            assignee=args.get("assignee")
+            assignee=args.get("assignee"),
+            created_at=self._now_iso()
         )
         
-        self.tasks[task.id] = asdict(task)
-        self._save_json("tasks.json", self.tasks)
+        self.tasks[task.id] = _to_record(task)
+        _add_prefix(self._task_prefixes, task.id)
+        self._tasks_by_status.setdefault(task.status, {})[task.id] = None
+        self._task_order[task.id] = len(self._task_order)
+        self._save_entry("tasks.json", self.tasks, [task.id])
         
         # Try to sync with cmem if integration is active
-        await self._sync_task_to_cmem(task, "add")
+        self._queue_cmem(self._sync_task_to_cmem, task, "add")
         
         return self.content_text(f"Added task: {task.id[:8]} - {task.content}")
     
     async def _task_list(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """List tasks."""
+        await self._load("tasks")
         status_filter = args.get("status")
         
-        tasks = []
-        for task_id, task in self.tasks.items():
-            if status_filter and task["status"] != status_filter:
-                continue
-            tasks.append(f"[{task['status']}] {task_id[:8]} - {task['content']} ({task['priority']})")
+        if status_filter:
+            # Only the tasks with that status are visited
+            all_tasks = self.tasks
+            if status_filter in self._unsorted_statuses:
+                self._unsorted_statuses.discard(status_filter)
+                ids = self._tasks_by_status[status_filter]
+                self._tasks_by_status[status_filter] = dict.fromkeys(sorted(ids, key=self._task_order.__getitem__))
+            tasks = [f"[{status_filter}] {task_id[:8]} - {all_tasks[task_id]['content']} ({all_tasks[task_id]['priority']})"
+                     for task_id in self._tasks_by_status.get(status_filter, ())]
+        else:
+            tasks = [f"[{task['status']}] {task_id[:8]} - {task['content']} ({task['priority']})"
+                     for task_id, task in self.tasks.items()]
         
         if not tasks:
             return self.content_text("No tasks found")
@@ -333,117 +693,130 @@ class MemoryServer(BaseMCPServer):
     
     async def _task_update(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Update task status."""
+        await self._load("tasks")
         task_id = args["task_id"]
         new_status = args["status"]
         
         # Find task by ID or partial ID
-        full_id = None
-        for tid in self.tasks:
-            if tid.startswith(task_id):
-                full_id = tid
-                break
+        full_id = _find_id(self.tasks, self._task_prefixes, task_id)
         
         if not full_id:
             return self.content_text(f"Task {task_id} not found")
         
+        old_status = self.tasks[full_id]["status"]
+        if new_status != old_status:
+            self._tasks_by_status.get(old_status, {}).pop(full_id, None)
+            ids = self._tasks_by_status.setdefault(new_status, {})
+            order = self._task_order.setdefault(full_id, len(self._task_order))
+            if ids and self._task_order[next(reversed(ids))] > order:
+                self._unsorted_statuses.add(new_status)
+            ids[full_id] = None
         self.tasks[full_id]["status"] = new_status
         if new_status == "completed":
-            self.tasks[full_id]["completed_at"] = datetime.now().isoformat()
+            self.tasks[full_id]["completed_at"] = self._now_iso()
             # Sync completion to cmem
             task_obj = Task(**self.tasks[full_id])
-            await self._sync_task_to_cmem(task_obj, "complete")
+            self._queue_cmem(self._sync_task_to_cmem, task_obj, "complete")
         
-        self._save_json("tasks.json", self.tasks)
+        self._save_entry("tasks.json", self.tasks, [full_id])
         
         return self.content_text(f"Updated task {full_id[:8]} to {new_status}")
     
     async def _decision_add(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Record a decision."""
+        await self._load("decisions")
         decision = Decision(
-            id=str(uuid4()),
+            id=uuid4().hex,
             choice=args["choice"],
             reasoning=args["reasoning"],
-            alternatives=args["alternatives"]
+            alternatives=args["alternatives"],
+            created_at=self._now_iso()
         )
         
-        self.decisions[decision.id] = asdict(decision)
-        self._save_json("decisions.json", self.decisions)
+        self.decisions[decision.id] = _to_record(decision)
+        self._save_entry("decisions.json", self.decisions, [decision.id])
         
         # Try to sync with cmem
-        await self._sync_decision_to_cmem(decision)
+        self._queue_cmem(self._sync_decision_to_cmem, decision)
         
         return self.content_text(f"Recorded decision: {decision.choice}")
     
     async def _pattern_add(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Add a pattern."""
+        await self._load("patterns")
         pattern = Pattern(
-            id=str(uuid4()),
+            id=uuid4().hex,
             pattern=args["pattern"],
             description=args["description"],
             priority=args.get("priority", "medium"),
-            effectiveness=args.get("effectiveness", 0.5)
+            effectiveness=args.get("effectiveness", 0.5),
+            created_at=self._now_iso()
         )
         
-        self.patterns[pattern.id] = asdict(pattern)
-        self._save_json("patterns.json", self.patterns)
+        self.patterns[pattern.id] = _to_record(pattern)
+        _add_prefix(self._pattern_prefixes, pattern.id)
+        self._save_entry("patterns.json", self.patterns, [pattern.id])
         
         # Try to sync with cmem
-        await self._sync_pattern_to_cmem(pattern, "add")
+        self._queue_cmem(self._sync_pattern_to_cmem, pattern, "add")
         
         return self.content_text(f"Added pattern: {pattern.pattern}")
     
     async def _pattern_resolve(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Resolve a pattern."""
+        await self._load("patterns")
         pattern_id = args["pattern_id"]
         solution = args["solution"]
         
         # Find pattern by ID or partial ID
-        full_id = None
-        for pid in self.patterns:
-            if pid.startswith(pattern_id):
-                full_id = pid
-                break
+        full_id = _find_id(self.patterns, self._pattern_prefixes, pattern_id)
         
         if not full_id:
             return self.content_text(f"Pattern {pattern_id} not found")
         
+        if not self.patterns[full_id]["resolved"]:
+            self._resolved_pattern_count += 1
         self.patterns[full_id]["resolved"] = True
         self.patterns[full_id]["solution"] = solution
         
-        self._save_json("patterns.json", self.patterns)
+        self._save_entry("patterns.json", self.patterns, [full_id])
         
         return self.content_text(f"Resolved pattern with: {solution}")
     
     async def _knowledge_add(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Store knowledge."""
+        await self._load("knowledge")
         key = args["key"]
         value = args["value"]
         category = args.get("category", "general")
         
         if category not in self.knowledge:
             self.knowledge[category] = {}
+        if key not in self.knowledge[category]:
+            self._knowledge_item_count += 1
+            self._knowledge_keys.setdefault(key, []).append(category)
         
         self.knowledge[category][key] = {
             "value": value,
-            "created_at": datetime.now().isoformat()
+            "created_at": self._now_iso()
         }
         
-        self._save_json("knowledge.json", self.knowledge)
+        self._save_entry("knowledge.json", self.knowledge, [category, key])
         
         return self.content_text(f"Stored knowledge: {key} in {category}")
     
     async def _knowledge_get(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Retrieve knowledge."""
+        await self._load("knowledge")
         key = args.get("key")
         category = args.get("category")
         
         results = []
         
         if key:
-            # Search for specific key across categories
-            for cat, items in self.knowledge.items():
-                if key in items:
-                    results.append(f"[{cat}] {key}: {items[key]['value']}")
+            # Look the key up in every category that has it
+            for cat in self._knowledge_keys.get(key, ()):
+                results.append(f"[{cat}] {key}: {self.knowledge[cat][key]['value']}")
         elif category:
             # Get all items in category
             if category in self.knowledge:
@@ -461,24 +834,19 @@ class MemoryServer(BaseMCPServer):
     
     async def _project_switch(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Switch project context."""
+        await self.flush()
         self.current_project = args["project"]
         self._load_memory()
         
         return self.content_text(f"Switched to project: {self.current_project}")
     
-    async def _memory_summary(self) -> Dict[str, Any]:
+    async def _memory_summary(self, args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get memory summary."""
-        # Count items by status
-        task_stats = {"pending": 0, "in_progress": 0, "completed": 0}
-        for task in self.tasks.values():
-            task_stats[task["status"]] += 1
-        
-        pattern_stats = {"resolved": 0, "unresolved": 0}
-        for pattern in self.patterns.values():
-            if pattern["resolved"]:
-                pattern_stats["resolved"] += 1
-            else:
-                pattern_stats["unresolved"] += 1
+        await self._load(*DATA_FILES)
+        task_stats = {status: len(self._tasks_by_status.get(status, ()))
+                      for status in ("pending", "in_progress", "completed")}
+        resolved = self._resolved_pattern_count
+        pattern_stats = {"resolved": resolved, "unresolved": len(self.patterns) - resolved}
         
         summary = f"""Memory Summary for Project: {self.current_project}
 
@@ -494,43 +862,76 @@ Patterns:
   - Unresolved: {pattern_stats['unresolved']}
   
 Knowledge Categories: {len(self.knowledge)}
-Total Knowledge Items: {sum(len(items) for items in self.knowledge.values())}
+Total Knowledge Items: {self._knowledge_item_count}
 """
         
         return self.content_text(summary)
     
+    def _queue_cmem(self, sync: Callable[..., Awaitable[None]], *args: Any):
+        """Schedule sync(*args) to run after earlier queued cmem syncs."""
+        if not self.cmem_integration:
+            return
+        
+        queue = self._cmem_queue
+        if queue is None:
+            queue = self._cmem_queue = asyncio.Queue(maxsize=CMEM_QUEUE_SIZE)
+            self._cmem_worker = asyncio.get_running_loop().create_task(self._cmem_sync_worker())
+        if queue.full():
+            # cmem is falling behind; it is only a best-effort mirror
+            queue.get_nowait()
+            queue.task_done()
+        queue.put_nowait((sync, args))
+    
+    async def _cmem_sync_worker(self):
+        """Run queued cmem syncs in order."""
+        queue = self._cmem_queue
+        while True:
+            sync, args = await queue.get()
+            try:
+                await sync(*args)
+            except Exception:
+                # The sync helpers swallow their own errors; keep going
+                pass
+            finally:
+                queue.task_done()
+    
+    async def _cmem_idle(self):
+        """Wait until every queued cmem sync has run."""
+        if self._cmem_queue is not None:
+            await self._cmem_queue.join()
+    
+    async def _run_cmem(self, args: List[str]):
+        """Run one cmem command to completion, discarding its output."""
+        # The executable is resolved once; without a path exec searches PATH
+        proc = await asyncio.create_subprocess_exec(
+            self._cmem_path or "cmem", *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        await proc.wait()
+    
     async def _sync_task_to_cmem(self, task: Task, action: str):
         """Sync task with cmem if integration is active."""
         if not self.cmem_integration:
             return
         
         try:
-            import subprocess
-            import asyncio
-            
             if action == "add":
                 # Map our priority to cmem priority
                 priority_map = {"low": "low", "medium": "medium", "high": "high"}
                 cmem_priority = priority_map.get(task.priority, "medium")
                 
                 # Add task to cmem
-                cmd = ['cmem', 'task', 'add', task.content, '--priority', cmem_priority]
+                args = ['task', 'add', task.content, '--priority', cmem_priority]
                 if task.assignee:
-                    cmd.extend(['--assignee', task.assignee])
-                
-                result = await asyncio.create_subprocess_exec(
-                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                await result.communicate()
+                    args.extend(['--assignee', task.assignee])
+                await self._run_cmem(args)
                 
             elif action == "complete":
                 # Try to find and complete corresponding cmem task
                 # This is best-effort since we don't have direct ID mapping
-                cmd = ['cmem', 'task', 'complete', task.content[:50]]  # Use content prefix
-                result = await asyncio.create_subprocess_exec(
-                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                await result.communicate()
+                await self._run_cmem(['task', 'complete', task.content[:50]])  # Use content prefix
         
         except Exception:
             # Fail silently - cmem sync is optional
@@ -542,19 +943,12 @@ Total Knowledge Items: {sum(len(items) for items in self.knowledge.values())}
             return
         
         try:
-            import subprocess
-            import asyncio
-            
             if action == "add":
                 # Add pattern to cmem
-                cmd = ['cmem', 'pattern', 'add', pattern.pattern, pattern.description]
+                args = ['pattern', 'add', pattern.pattern, pattern.description]
                 if pattern.priority != "medium":
-                    cmd.extend(['--priority', pattern.priority])
-                
-                result = await asyncio.create_subprocess_exec(
-                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                await result.communicate()
+                    args.extend(['--priority', pattern.priority])
+                await self._run_cmem(args)
         
         except Exception:
             # Fail silently - cmem sync is optional
@@ -566,23 +960,14 @@ Total Knowledge Items: {sum(len(items) for items in self.knowledge.values())}
             return
         
         try:
-            import subprocess
-            import asyncio
-            
             # Add decision to cmem
             alternatives_str = ', '.join(decision.alternatives)
-            cmd = ['cmem', 'decision', decision.choice, decision.reasoning, alternatives_str]
-            
-            result = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            await result.communicate()
+            await self._run_cmem(['decision', decision.choice, decision.reasoning, alternatives_str])
         
         except Exception:
             # Fail silently - cmem sync is optional
             pass
 
-
 if __name__ == "__main__":
     server = MemoryServer()
     asyncio.run(server.run())
\ No newline at end of file
@@ -327,6 +327,12 @@ setup(
             'mypy>=1.0.0',
             'ruff>=0.1.0',
         ],
+        'fast': [
+            'uvloop>=0.17.0;sys_platform!="win32"',
+            'orjson>=3.6.0',
+            'watchfiles>=0.18.0',
+            'google-re2>=1.0',
+        ],
         'docs': [
             'sphinx>=6.0.0',
             'sphinx-rtd-theme>=1.3.0',
@@ -5,10 +5,12 @@ import pytest_asyncio
 import asyncio
 import json
 from unittest.mock import Mock, AsyncMock, patch
+from jsonpath_ng import parse
 
 from mcp_browser import MCPBrowser
 from mcp_browser.registry import ToolRegistry
 from mcp_browser.filter import MessageFilter, VirtualToolHandler
+from mcp_browser.buffer import JsonRpcBuffer
 
 
 class TestToolRegistry:
@@ -28,6 +30,35 @@ class TestToolRegistry:
         assert registry.get_tool("tool1")["description"] == "Tool 1"
         assert registry.get_all_tool_names() == ["tool1", "tool2"]
     
+    def test_server_tools(self):
+        """Test per-server tool updates."""
+        registry = ToolRegistry()
+        registry.add_server_tools("a", [{"name": "a1"}, {"name": "shared", "from": "a"}])
+        registry.add_server_tools("b", [{"name": "b1"}])
+        assert [t["name"] for t in registry.raw_tool_list] == ["a1", "shared", "b1"]
+        
+        registry.add_server_tools("b", [{"name": "b2"}, {"name": "shared", "from": "b"}])
+        assert registry.get_tool("b1") is None
+        assert registry.get_tool("shared")["from"] == "b"
+        
+        registry.remove_server_tools("b")
+        assert sorted(registry.tools) == ["a1", "shared"]
+        assert registry.get_tool("shared")["from"] == "a"
+        assert [t["name"] for t in registry.raw_tool_list] == ["a1", "shared"]
+    
+    def test_update_tools_by_server(self):
+        """Test that a whole-catalog update only touches changed servers."""
+        registry = ToolRegistry()
+        registry.update_tools([{"name": "old"}])
+        a_tools = [{"name": "a1"}]
+        registry.update_tools_by_server({"a": a_tools, "b": [{"name": "b1"}]})
+        assert registry.get_all_tool_names() == ["a1", "b1"]
+        
+        registry.update_tools_by_server({"a": [{"name": "a1"}], "c": [{"name": "c1"}]})
+        assert registry.get_tool("a1") is a_tools[0]
+        assert sorted(registry.tools) == ["a1", "c1"]
+        assert [t["name"] for t in registry.raw_tool_list] == ["a1", "c1"]
+    
     def test_discover_jsonpath(self):
         """Test JSONPath discovery."""
         registry = ToolRegistry()
@@ -43,7 +74,80 @@ class TestToolRegistry:
         assert registry.discover("$.tools[0].description") == "Run commands"
         assert registry.discover("$.tools[1].name") == "Read"
         assert registry.discover("$.nonexistent") is None
-    
+
+    def test_discover_fast_paths(self):
+        """Test that fast-path queries match the generic JSONPath walk."""
+        from mcp_browser.registry import _FAST_PATHS
+        registry = ToolRegistry()
+        registry.update_tools([
+            {"name": "Bash", "description": "Run commands", "inputSchema": {"type": "object"}},
+            {"name": "Read", "description": "Read files"}
+        ])
+        registry.update_metadata("servers", {"a": {"status": "running"}, "b": {"status": "offline"}})
+        search_data = {
+            "tools": registry.raw_tool_list,
+            "tool_names": registry.get_all_tool_names(),
+            "servers": registry._metadata["servers"],
+        }
+        
+        for query in _FAST_PATHS:
+            matches = parse(query).find(search_data)
+            values = [m.value for m in matches]
+            expected = None if not values else values[0] if len(values) == 1 else values
+            assert registry.discover(query) == expected
+        
+        assert registry.discover("$.tools[?(@.name=='Bash')]")["description"] == "Run commands"
+        assert registry.discover('$.tools[?(@.name == "Read")]')["name"] == "Read"
+        assert registry.discover("$.tools[?(@.name=='Missing')]") is None
+        assert registry.discover("$.tools_by_name['Bash']")["description"] == "Run commands"
+        assert registry.discover("$.tools_by_name.Read.name") == "Read"
+
+    def test_discover_regex(self):
+        """Test regex queries, including the plain-literal shortcut."""
+        registry = ToolRegistry()
+        registry.update_tools([
+            {"name": "memory::store", "description": "Store a Task"},
+            {"name": "screen::list", "description": "List sessions"},
+            {"name": "Read", "description": "Read files"}
+        ])
+
+        names = lambda result: [t["name"] for t in result or []]
+        assert names(registry.discover("$.tools[?(@.name =~ /memory|screen/)]")) == ["memory::store", "screen::list"]
+        assert names(registry.discover("$.tools[?(@.name =~ /READ/i)]")) == ["Read"]
+        assert registry.discover("$.tools[?(@.name =~ /READ/)]") is None
+        assert names(registry.discover("$.tools[?(@.description =~ /task|files/i)]")) == ["memory::store", "Read"]
+        assert names(registry.discover("$.tools[?(@.name =~ /^s.*list$/)]")) == ["screen::list"]
+        assert registry.discover("$.tools[?(@.name =~ /(/)]") is None
+
+    def test_discover_cache_invalidation(self):
+        """Test memoized discovery results are dropped on registry changes."""
+        registry = ToolRegistry()
+        registry.update_tools([{"name": "Bash"}])
+        assert registry.discover("$.tools[*].name") == "Bash"
+
+        registry.update_tools([{"name": "Bash"}, {"name": "Read"}])
+        assert registry.discover("$.tools[*].name") == ["Bash", "Read"]
+
+        assert registry.discover("$.servers.default") is None
+        registry.update_metadata("servers", {"default": {"status": "running"}})
+        assert registry.discover("$.servers.default.status") == "running"
+
+    def test_api_documentation_cached(self):
+        """Test the API document is reused until the registry changes."""
+        registry = ToolRegistry()
+        registry.update_tools([{"name": "Bash"}])
+        registry.update_metadata("servers", {"default": {"tools": [{"name": "Bash"}]}})
+
+        doc = registry.get_full_api_documentation()
+        doc["generation_timestamp"] = "now"
+        again = registry.get_full_api_documentation()
+        assert again["generation_timestamp"] is None
+        assert again["servers"] is doc["servers"]
+        assert again["servers"]["default"]["tool_names"] == ["Bash"]
+
+        registry.update_tools([{"name": "Bash"}, {"name": "Read"}])
+        assert registry.get_full_api_documentation()["total_tools"] == 2
+
     def test_sparse_tools(self):
         """Test sparse tool generation."""
         registry = ToolRegistry()
@@ -55,6 +159,63 @@ class TestToolRegistry:
         assert sparse[1]["name"] == "mcp_call"
         assert sparse[2]["name"] == "onboarding"
         assert "2 hidden tools" in sparse[0]["description"]
+        
+        # Rebuilt only when the tool count changes
+        assert registry.get_sparse_tools() is sparse
+        assert json.loads(registry.get_sparse_tools_json()) == sparse
+        registry.update_tools([{"name": "tool1"}])
+        assert "1 hidden tools" in registry.get_sparse_tools()[0]["description"]
+        
+        # Mutating one registry's list leaves the shared templates intact
+        sparse = registry.get_sparse_tools()
+        sparse[0]["inputSchema"]["required"].append("extra")
+        assert ToolRegistry().get_sparse_tools()[0]["inputSchema"]["required"] == ["jsonpath"]
+
+
+class TestJsonRpcBuffer:
+    """Test JSON-RPC message framing."""
+    
+    def test_complete_lines(self):
+        """Test extracting several complete messages at once."""
+        buffer = JsonRpcBuffer()
+        messages = buffer.append('{"jsonrpc": "2.0", "id": 1}\n{"jsonrpc": "2.0", "id": 2}\n')
+        assert [m["id"] for m in messages] == [1, 2]
+    
+    def test_partial_lines(self):
+        """Test messages split across several chunks."""
+        buffer = JsonRpcBuffer()
+        assert buffer.append('{"jsonrpc": ') == []
+        assert buffer.append('"2.0", "id"') == []
+        messages = buffer.append(': 3}\n{"jsonrpc": "2.0",')
+        assert [m["id"] for m in messages] == [3]
+        messages = buffer.append(' "id": 4}\n')
+        assert [m["id"] for m in messages] == [4]
+    
+    def test_invalid_lines_skipped(self):
+        """Test that malformed and non JSON-RPC lines are dropped."""
+        buffer = JsonRpcBuffer()
+        messages = buffer.append('not json\n[1, 2]\n\n{"jsonrpc": "2.0", "id": 5}\n')
+        assert [m["id"] for m in messages] == [5]
+    
+    def test_batch_response(self):
+        """Test that a batch array is split into its messages."""
+        buffer = JsonRpcBuffer()
+        messages = buffer.append('[{"jsonrpc": "2.0", "id": 1}, 3, {"jsonrpc": "2.0", "id": 2}]\n')
+        assert [m["id"] for m in messages] == [1, 2]
+    
+    def test_bytes_input(self):
+        """Test that raw pipe bytes are parsed without decoding first."""
+        buffer = JsonRpcBuffer()
+        assert buffer.append(b'{"jsonrpc": "2.0", "id": 7, "result": "\xc3') == []
+        messages = buffer.append(b'\xa9"}\n\xff\n{"jsonrpc": "2.0", "id": 8}\n')
+        assert [(m["id"], m.get("result")) for m in messages] == [(7, "é"), (8, None)]
+
+    def test_clear(self):
+        """Test that clear drops buffered partial data."""
+        buffer = JsonRpcBuffer()
+        buffer.append('{"jsonrpc": "2.0", ')
+        buffer.clear()
+        assert buffer.append('{"jsonrpc": "2.0", "id": 6}\n')[0]["id"] == 6
 
 
 class TestMessageFilter:
@@ -107,6 +268,258 @@ class TestMessageFilter:
         
         # ID should be removed from handled set
         assert 123 not in filter._handled_ids
+    
+    def test_inplace_filtering(self):
+        """Test that in-place filtering rewrites tools/list without copying the message."""
+        registry = ToolRegistry()
+        filter = MessageFilter(registry)
+        
+        message = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": {"tools": [{"name": "tool1"}, {"name": "tool2"}]}
+        }
+        result = message["result"]
+        
+        assert filter.filter_incoming_inplace(message) is True
+        assert [t["name"] for t in message["result"]["tools"]] == ["mcp_discover", "mcp_call", "onboarding"]
+        # The original result may belong to someone else and is left alone
+        assert [t["name"] for t in result["tools"]] == ["tool1", "tool2"]
+        assert registry.get_all_tool_names() == ["tool1", "tool2"]
+        
+        # Duplicate errors for handled requests are blocked
+        filter.mark_handled(2)
+        assert filter.filter_incoming_inplace({
+            "jsonrpc": "2.0",
+            "id": 2,
+            "error": {"code": -32603, "message": "Tool not found"}
+        }) is False
+
+
+@pytest.mark.asyncio
+class TestMultiServerManager:
+    """Test routing across built-in servers."""
+    
+    async def test_parallel_routing_keeps_per_server_order(self):
+        """Test that calls to one server stay ordered while servers overlap."""
+        from mcp_browser.multi_server import MultiServerManager
+        manager = MultiServerManager()
+        events = []
+        
+        def make_server(name):
+            async def send_request(method, params):
+                events.append((name, params["arguments"]["n"], "start"))
+                await asyncio.sleep(0)
+                events.append((name, params["arguments"]["n"], "end"))
+                if params["name"] == "fail":
+                    raise Exception("boom")
+                return {"n": params["arguments"]["n"]}
+            server = Mock()
+            server.send_request = send_request
+            return server
+        
+        manager.servers = {"a": make_server("a"), "b": make_server("b")}
+        results = await manager.route_tool_calls_parallel([
+            ("a::t", {"n": 1}),
+            ("b::t", {"n": 2}),
+            ("a::fail", {"n": 3}),
+        ])
+        
+        assert results[0] == {"n": 1}
+        assert results[1] == {"n": 2}
+        assert isinstance(results[2], Exception)
+        # Server a runs its calls back to back; b runs alongside it
+        a_events = [e for e in events if e[0] == "a"]
+        assert a_events == [("a", 1, "start"), ("a", 1, "end"), ("a", 3, "start"), ("a", 3, "end")]
+        assert events.index(("b", 2, "start")) < events.index(("a", 1, "end"))
+
+
+@pytest.mark.asyncio
+class TestMCPServer:
+    """Test request bookkeeping in MCPServer."""
+
+    async def test_pending_request_slots(self):
+        """Test that out-of-order replies resolve the right requests."""
+        from mcp_browser.server import MCPServer
+        from mcp_browser.config import MCPServerConfig
+        server = MCPServer(MCPServerConfig(command=["true"]))
+        server.process = Mock()
+        server._write_queue = asyncio.Queue()
+
+        # A request that cannot be serialized does not use up an id
+        with pytest.raises(TypeError):
+            await server.send_request("tools/call", {"n": object()})
+
+        tasks = [asyncio.create_task(server.send_request("tools/call", {"n": n})) for n in range(3)]
+        await asyncio.sleep(0)
+        assert server._write_queue.qsize() == 3
+
+        # Client ids that look like ours but are strings are left alone
+        await server._handle_message({"jsonrpc": "2.0", "id": "-2", "result": {"id": "client"}})
+        # Our ids are negative, so client ids counting up from 1 never match
+        for request_id in (2, 1):
+            await server._handle_message({"jsonrpc": "2.0", "id": request_id, "result": {"id": "client"}})
+        for request_id in (-2, -3, -1):
+            await server._handle_message({"jsonrpc": "2.0", "id": request_id, "result": {"id": request_id}})
+        # Stale and foreign ids are ignored
+        for request_id in (-2, "1", "x", True, None):
+            await server._handle_message({"jsonrpc": "2.0", "id": request_id, "result": {}})
+
+        assert [await t for t in tasks] == [{"id": -1}, {"id": -2}, {"id": -3}]
+        assert server._pending_requests == []
+        assert server._pending_base == 4
+
+    async def test_pending_list_compaction(self):
+        """Test that answered slots behind a slow request are trimmed."""
+        from mcp_browser.server import MCPServer, PENDING_COMPACT_AT
+        from mcp_browser.config import MCPServerConfig
+        server = MCPServer(MCPServerConfig(command=["true"]))
+        server.process = Mock()
+        server._write_queue = asyncio.Queue()
+
+        slow = asyncio.create_task(server.send_request("tools/call", {}))
+        for _ in range(PENDING_COMPACT_AT + 1):
+            fast = asyncio.create_task(server.send_request("tools/call", {}))
+            await asyncio.sleep(0)
+            await server._handle_message({"jsonrpc": "2.0", "id": -(server._pending_base + len(server._pending_requests) - 1), "result": {}})
+            await fast
+        fast = asyncio.create_task(server.send_request("tools/call", {}))
+        await asyncio.sleep(0)
+
+        # The slow head pins every slot until it resolves; then the prefix goes
+        assert len(server._pending_requests) == PENDING_COMPACT_AT + 3
+        await server._handle_message({"jsonrpc": "2.0", "id": -1, "result": "slow"})
+        assert await slow == "slow"
+        assert len(server._pending_requests) == 1
+        await server._handle_message({"jsonrpc": "2.0", "id": -(server._pending_base + len(server._pending_requests) - 1), "result": "last"})
+        assert await fast == "last"
+
+    async def test_send_requests_pipelined(self):
+        """Test that a batch of requests is written at once and resolved by id."""
+        from mcp_browser.server import MCPServer
+        from mcp_browser.config import MCPServerConfig
+        server = MCPServer(MCPServerConfig(command=["true"]))
+        server.process = Mock()
+        server._write_queue = asyncio.Queue()
+
+        with pytest.raises(TypeError):
+            server.send_requests([("tools/call", {"n": 0}), ("tools/call", {"n": object()})])
+        assert server._pending_requests == []
+
+        futures = server.send_requests([("tools/call", {"n": n}) for n in range(3)])
+        assert server._write_queue.qsize() == 1
+        requests = [json.loads(line) for line in server._write_queue.get_nowait().splitlines()]
+        assert [r["params"]["n"] for r in requests] == [0, 1, 2]
+
+        for request in reversed(requests):
+            await server._handle_message({"jsonrpc": "2.0", "id": request["id"], "result": request["params"]["n"]})
+        assert await asyncio.gather(*futures) == [0, 1, 2]
+
+    async def test_error_reply_keeps_code(self):
+        """Test that error replies raise MCPError with the server's code."""
+        from mcp_browser.server import MCPServer, MCPError
+        from mcp_browser.config import MCPServerConfig
+        server = MCPServer(MCPServerConfig(command=["true"]))
+        server.process = Mock()
+        server._write_queue = asyncio.Queue()
+
+        request = asyncio.create_task(server.send_request("tools/call", {}))
+        await asyncio.sleep(0)
+        await server._handle_message({
+            "jsonrpc": "2.0", "id": -1, "error": {"code": -32601, "message": "Method not found"}
+        })
+
+        with pytest.raises(MCPError) as info:
+            await request
+        assert info.value.to_error() == {"code": -32601, "message": "Method not found"}
+
+    async def test_message_handlers(self):
+        """Test that handlers see every message but our replies, and can be removed."""
+        from mcp_browser.server import MCPServer
+        from mcp_browser.config import MCPServerConfig
+        server = MCPServer(MCPServerConfig(command=["true"]))
+        server.process = Mock()
+        server._write_queue = asyncio.Queue()
+        seen = []
+
+        def once(message):
+            seen.append(("once", message["method"]))
+            server.remove_message_handler(once)
+
+        server.add_message_handler(once)
+        server.add_message_handler(lambda message: seen.append(("all", message["method"])))
+        for method in ("a", "b"):
+            await server._handle_message({"jsonrpc": "2.0", "method": method})
+
+        assert seen == [("once", "a"), ("all", "a"), ("all", "b")]
+        
+        request = asyncio.create_task(server.send_request("tools/call", {}))
+        await asyncio.sleep(0)
+        await server._handle_message({"jsonrpc": "2.0", "id": -1, "result": "mine", "method": "reply"})
+        assert await request == "mine"
+        assert seen == [("once", "a"), ("all", "a"), ("all", "b")]
+
+    async def test_frames_share_one_write(self):
+        """Test that requests and raw frames queued together are written once."""
+        from mcp_browser.server import MCPServer
+        from mcp_browser.config import MCPServerConfig
+        server = MCPServer(MCPServerConfig(command=["true"]))
+        server.process = Mock()
+        server.process.stdin.drain = AsyncMock()
+        server._write_queue = asyncio.Queue()
+
+        request = asyncio.create_task(server.send_request("tools/list"))
+        call = asyncio.create_task(server.send_request("tools/call", {"name": "x", "arguments": {"q": "\u00fc"}}))
+        await asyncio.sleep(0)
+        server.send_raw('{"jsonrpc": "2.0", "method": "ping"}')
+        server.send_raw(b'{"jsonrpc": "2.0", "method": "pong"}\n')
+        writer = asyncio.create_task(server._write_frames())
+        await asyncio.sleep(0)
+
+        server.process.stdin.write.assert_called_once()
+        data = server.process.stdin.write.call_args[0][0]
+        messages = [json.loads(line) for line in data.splitlines()]
+        assert [m["method"] for m in messages] == ["tools/list", "tools/call", "ping", "pong"]
+        assert messages[1] == {
+            "jsonrpc": "2.0", "id": -2, "method": "tools/call",
+            "params": {"name": "x", "arguments": {"q": "\u00fc"}}
+        }
+        server.process.stdin.drain.assert_awaited_once()
+
+        writer.cancel()
+        request.cancel()
+        call.cancel()
+
+
+
+@pytest.mark.asyncio
+class TestConfigWatch:
+    """Test the shared config file watcher."""
+    
+    async def test_config_watch_hub(self, tmp_path, monkeypatch):
+        """Test that one hub notifies every watcher of a changed file."""
+        import os
+        from mcp_browser import config_watch
+        monkeypatch.setattr(config_watch, "awatch", None)
+        monkeypatch.setattr(config_watch, "POLL_INTERVAL", 0.01)
+        
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("servers: {}\n")
+        hub = config_watch.get_watch_hub()
+        seen_a, seen_b = [], []
+        hub.register(config_path, seen_a.append)
+        hub.register(config_path, seen_b.append)
+        
+        os.utime(config_path, (1000, 1000))
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if seen_a and seen_b:
+                break
+        assert seen_a == seen_b == [1000]
+        
+        hub.unregister(config_path, seen_a.append)
+        hub.unregister(config_path, seen_b.append)
+        assert hub._task is None
 
 
 @pytest.mark.asyncio
@@ -211,6 +624,288 @@ class TestMCPBrowser:
         assert content2["name"] == "tool1"
         assert content2["description"] == "First tool"
 
+    def _make_forwarding_browser(self, timeout=30.0):
+        """Browser wired to a mock main server, no real processes."""
+        from mcp_browser.config import MCPBrowserConfig
+        browser = MCPBrowser(enable_builtin_servers=False)
+        browser.config = MCPBrowserConfig(servers={}, timeout=timeout)
+        browser._cache_config_values()
+        browser.registry = ToolRegistry()
+        browser.filter = MessageFilter(browser.registry, sparse_mode=True)
+        browser.virtual_handler = VirtualToolHandler(browser.registry, browser._forward_to_server)
+        browser.server = Mock()
+        browser._initialized = True
+        return browser
+    
+    async def test_forwarded_call_response(self):
+        """Test that server responses resolve the pending call."""
+        browser = self._make_forwarding_browser()
+        loop = asyncio.get_running_loop()
+        
+        def reply(raw):
+            for line in raw.splitlines():
+                request = json.loads(line)
+                loop.call_soon(browser._handle_server_message, {
+                    "jsonrpc": "2.0",
+                    "id": request["id"],
+                    "result": {"content": [{"type": "text", "text": "ok"}]}
+                })
+        browser.server.send_raw.side_effect = reply
+        
+        response = await browser.call({
+            "jsonrpc": "2.0",
+            "id": 7,
+            "method": "tools/call",
+            "params": {"name": "Bash", "arguments": {"command": "ls"}}
+        })
+        
+        assert response["id"] == 7
+        assert response["result"]["content"][0]["text"] == "ok"
+        assert not browser._response_buffer
+        # The pending deadline no longer keeps the answered request alive,
+        # once the loop has let go of the callbacks that completed it
+        await asyncio.sleep(0)
+        assert [ref() for _, _, _, ref in browser._deadlines] == [None]
+    
+    async def test_concurrent_calls_share_one_write(self):
+        """Test that requests issued in the same tick are written together."""
+        browser = self._make_forwarding_browser()
+        loop = asyncio.get_running_loop()
+        
+        def reply(raw):
+            for line in raw.splitlines():
+                request = json.loads(line)
+                loop.call_soon(browser._handle_server_message, {
+                    "jsonrpc": "2.0",
+                    "id": request["id"],
+                    "result": {"echo": request["params"]["arguments"]["n"]}
+                })
+        browser.server.send_raw.side_effect = reply
+        
+        responses = await asyncio.gather(*[
+            browser.call({
+                "jsonrpc": "2.0",
+                "method": "tools/call",
+                "params": {"name": "Echo", "arguments": {"n": n}}
+            })
+            for n in range(5)
+        ])
+        
+        assert [r["result"]["echo"] for r in responses] == list(range(5))
+        assert browser.server.send_raw.call_count == 1
+    
+    async def test_forwarded_call_timeout(self):
+        """Test that unanswered requests time out with an error response."""
+        browser = self._make_forwarding_browser(timeout=0.05)
+        
+        response = await browser.call({
+            "jsonrpc": "2.0",
+            "id": 8,
+            "method": "tools/call",
+            "params": {"name": "Bash", "arguments": {}}
+        })
+        
+        assert response["id"] == 8
+        assert response["error"]["message"] == "Request timeout"
+        assert not browser._response_buffer
+    
+    async def test_catalog_refresh_beside_client_calls(self):
+        """Test that a catalog refresh and client calls sharing the pipe keep their replies."""
+        from mcp_browser.server import MCPServer
+        from mcp_browser.config import MCPServerConfig
+        browser = self._make_forwarding_browser()
+        server = browser.server = MCPServer(MCPServerConfig(command=["true"]))
+        server.process = Mock()
+        server._write_queue = asyncio.Queue()
+        server.add_message_handler(browser._handle_server_message)
+        tools = [{"name": "Bash"}, {"name": "Read"}]
+        
+        fetch = asyncio.create_task(browser._fetch_catalog())
+        call = asyncio.create_task(browser.call({
+            "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+            "params": {"name": "Bash", "arguments": {}}
+        }))
+        await asyncio.sleep(0.01)
+        requests = []
+        while not server._write_queue.empty():
+            requests += [json.loads(line) for line in server._write_queue.get_nowait().splitlines()]
+        ids = {r["method"]: r["id"] for r in requests}
+        assert ids["tools/list"] != ids["tools/call"]
+        
+        await server._handle_message({"jsonrpc": "2.0", "id": ids["tools/call"], "result": {"content": "ran"}})
+        await server._handle_message({"jsonrpc": "2.0", "id": ids["tools/list"], "result": {"tools": tools}})
+        
+        assert (await call)["result"] == {"content": "ran"}
+        assert await fetch == tools
+        assert [t["name"] for t in tools] == ["Bash", "Read"]
+    
+    async def test_lowered_timeout_expires_first(self):
+        """Test that a shorter timeout after a config reload is not held up by older requests."""
+        from mcp_browser.config import MCPBrowserConfig
+        browser = self._make_forwarding_browser(timeout=30.0)
+        request = {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "Bash", "arguments": {}}}
+        
+        slow = asyncio.ensure_future(browser.call(dict(request, id=1)))
+        await asyncio.sleep(0)
+        browser.config = MCPBrowserConfig(servers={}, timeout=0.05)
+        browser._cache_config_values()
+        
+        response = await asyncio.wait_for(browser.call(dict(request, id=2)), timeout=2)
+        assert response["error"]["message"] == "Request timeout"
+        assert not slow.done()
+        assert list(browser._response_buffer) == [1]
+        slow.cancel()
+
+    
+    async def test_builtin_tools_list_cached(self):
+        """Test that builtin-only tools/list reuses its sparse result."""
+        browser = self._make_forwarding_browser()
+        browser.server = None
+        browser.multi_server = Mock()
+        browser.multi_server.version = 1
+        browser.multi_server.get_all_tools = AsyncMock(
+            side_effect=lambda: [{"name": "builtin:memory::task_add", "description": "Add task",
+                                  "_server": "builtin:memory"}]
+        )
+        
+        request = {"jsonrpc": "2.0", "method": "tools/list", "params": {}}
+        first = await browser.call(dict(request, id=1))
+        second = await browser.call(dict(request, id=2))
+        
+        assert second["id"] == 2
+        assert [t["name"] for t in second["result"]["tools"]] == ["mcp_discover", "mcp_call", "onboarding"]
+        assert first["result"]["tools"] is second["result"]["tools"]
+        assert browser.multi_server.get_all_tools.await_count == 1
+        
+        # Configured servers changing (a config reload) shows in the counts
+        browser.registry.update_metadata("servers", {"a": {}, "b": {}, "c": {}})
+        third = await browser.call(dict(request, id=3))
+        assert "from 3 MCP servers" in third["result"]["tools"][0]["description"]
+        assert browser.multi_server.get_all_tools.await_count == 1
+        
+        # A changed server set refreshes the listing
+        browser.multi_server.version = 2
+        await browser.call(dict(request, id=4))
+        assert browser.multi_server.get_all_tools.await_count == 2
+        
+        # Stopped servers' tools leave the registry
+        browser.multi_server.servers = {"builtin:memory": Mock()}
+        browser.multi_server.stop_all = AsyncMock()
+        await browser.close()
+        assert browser.registry.get_all_tool_names() == []
+    
+    async def test_concurrent_initialize_runs_once(self):
+        """Test that concurrent initialize() calls share one startup."""
+        browser = MCPBrowser(enable_builtin_servers=False)
+        runs = []
+        
+        async def fake_initialize():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            browser._initialized = True
+        browser._do_initialize = fake_initialize
+        
+        await asyncio.gather(*[browser.initialize() for _ in range(5)])
+        assert runs == [1]
+        assert browser._init_task is None
+    
+    async def test_catalog_cache(self, tmp_path, monkeypatch):
+        """Test that a cached tool catalog is served while the refresh runs."""
+        from mcp_browser import proxy
+        from mcp_browser.config import MCPServerConfig
+        monkeypatch.setattr(proxy, "CATALOG_CACHE_DIR", tmp_path)
+        
+        browser = self._make_forwarding_browser()
+        browser._server_name = "main"
+        browser.config_loader.config_path = tmp_path / "missing.yaml"
+        browser.server.config = MCPServerConfig(command=["true"])
+        tools = [{"name": "Bash", "description": "Run commands"}]
+        browser.server.send_request = AsyncMock(side_effect=[
+            {},
+            {"tools": tools},
+        ])
+        
+        # Cold start: catalog is fetched and written to the cache
+        await browser._initialize_connection()
+        assert browser.registry.get_all_tool_names() == ["Bash"]
+        cache_path = browser._catalog_cache_path("main")
+        assert json.loads(cache_path.read_text())["tools"] == tools
+        
+        # Warm start: registry comes from the cache, refresh updates it later
+        browser.registry = ToolRegistry()
+        updated = tools + [{"name": "Read", "description": "Read files"}]
+        browser.server.send_request = AsyncMock(side_effect=[
+            {},
+            {"tools": updated},
+        ])
+        await browser._initialize_connection()
+        assert browser.registry.get_all_tool_names() == ["Bash"]
+        
+        await browser._catalog_refresh
+        assert browser.registry.get_all_tool_names() == ["Bash", "Read"]
+        assert json.loads(cache_path.read_text())["tools"] == updated
+        
+        # A changed setup ignores the stale catalog and rewrites the same
+        # file; catalogs named by the old setup hash are cleaned up
+        legacy = tmp_path / ("0" * 40 + ".json")
+        legacy.write_text("[]")
+        browser.registry = ToolRegistry()
+        browser.server.config = MCPServerConfig(command=["true"], args=["--other"])
+        browser.server.send_request = AsyncMock(side_effect=[
+            {},
+            {"tools": tools},
+        ])
+        await browser._initialize_connection()
+        assert browser.registry.get_all_tool_names() == ["Bash"]
+        assert json.loads(cache_path.read_text())["tools"] == tools
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["main.json"]
+
+
+@pytest.mark.asyncio
+class TestBaseMCPServer:
+    """Test the shared request handling of built-in servers."""
+    
+    async def test_static_responses(self):
+        """Test pre-serialized replies match handle_request and track new tools."""
+        from mcp_servers.base import BaseMCPServer
+        
+        class EchoServer(BaseMCPServer):
+            async def handle_tool_call(self, tool_name, arguments):
+                return self.content_text(tool_name)
+        
+        server = EchoServer("echo")
+        server.register_tool("one", "First", {"type": "object"})
+        
+        for method in ("initialize", "tools/list"):
+            request = {"jsonrpc": "2.0", "id": "r1", "method": method}
+            frame = server._static_response(method, "r1")
+            assert json.loads(frame) == await server.handle_request(request)
+        assert "handler" not in json.loads(server._static_response("tools/list", 1))["result"]["tools"][0]
+        assert server._static_response("tools/call", 1) is None
+        
+        server.register_tool("two", "Second", {"type": "object"})
+        tools = json.loads(server._static_response("tools/list", 2))["result"]["tools"]
+        assert [t["name"] for t in tools] == ["one", "two"]
+
+    
+    async def test_handler_only_server(self):
+        """Test that a server using only registered handlers needs no subclass method."""
+        from mcp_servers.base import BaseMCPServer
+        
+        server = BaseMCPServer("plain")
+        
+        async def ping(arguments):
+            return server.content_text("pong")
+        server.register_tool("ping", "Ping", {"type": "object"}, handler=ping)
+        server.register_tool("bare", "No handler", {"type": "object"})
+        
+        def call(name):
+            return server.handle_request({
+                "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                "params": {"name": name, "arguments": {}}
+            })
+        assert (await call("ping"))["result"]["content"][0]["text"] == "pong"
+        assert (await call("bare"))["error"]["message"] == "Tool 'bare' has no handler"
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
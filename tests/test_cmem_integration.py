@@ -262,6 +262,9 @@ class TestCmemIntegration:
                     "priority": "high"
                 })
                 
+                # Syncs run in the background; wait for them
+                await server._cmem_idle()
+                
                 # Verify sync was called
                 mock_sync.assert_called_once()
                 args = mock_sync.call_args[0]
@@ -297,6 +300,7 @@ class TestCmemIntegration:
                     "task_id": task_id,
                     "status": "completed"
                 })
+                await server._cmem_idle()
                 
                 # Verify sync was called
                 mock_sync.assert_called_once()
@@ -307,6 +311,259 @@ class TestCmemIntegration:
                 assert server.tasks[task_id]["status"] == "completed"
                 assert server.tasks[task_id]["completed_at"] is not None
 
+    
+    @pytest.mark.asyncio
+    async def test_saves_are_batched(self):
+        """Test that a burst of changes is written once, after a short delay."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="batched")
+        server.cmem_integration = False
+        tasks_log = server.project_dir / "tasks.log"
+        
+        with patch.object(server, '_write_files', wraps=server._write_files) as write:
+            for n in range(5):
+                await server._task_add({"content": f"Task {n}"})
+            assert not tasks_log.exists()
+            
+            await server.flush()
+            write.assert_called_once()
+        
+        with open(tasks_log) as f:
+            assert len(f.readlines()) == 5
+    
+    @pytest.mark.asyncio
+    async def test_changes_replay_and_compact(self):
+        """Test that logged changes are reloaded and folded into the data file."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="logged")
+        server.cmem_integration = False
+        
+        await server._task_add({"content": "First"})
+        await server._knowledge_add({"key": "k", "value": "v", "category": "c"})
+        await server.flush()
+        task_id = next(iter(server.tasks))
+        await server._task_update({"task_id": task_id, "status": "completed"})
+        await server.flush()
+        assert not (server.project_dir / "tasks.json").exists()
+        # An append cut short leaves a partial line, which is dropped
+        with open(server.project_dir / "tasks.log", "a") as f:
+            f.write('{"key": ["x')
+        
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            reloaded = MemoryServer(identity="logged")
+        assert reloaded.tasks == server.tasks
+        assert reloaded.tasks[task_id]["status"] == "completed"
+        assert reloaded.knowledge == {"c": {"k": server.knowledge["c"]["k"]}}
+        with open(server.project_dir / "tasks.log") as f:
+            assert f.read().endswith("}\n")
+        
+        with patch('mcp_servers.memory.memory_server.COMPACT_MIN_LOG', 0):
+            await server._task_add({"content": "Second"})
+            await server.flush()
+        assert not (server.project_dir / "tasks.log").exists()
+        with open(server.project_dir / "tasks.json") as f:
+            assert json.load(f) == server.tasks
+    
+    def test_find_id_by_prefix(self):
+        """Test that full, indexed, short and shared-prefix ids resolve."""
+        from mcp_servers.memory.memory_server import _index_prefixes, _find_id
+        
+        items = dict.fromkeys(["aaaaaaaa-1", "aaaaaaaa-2", "bbbbbbbb-1", "cccccccc-1"])
+        index = _index_prefixes(items)
+        assert _find_id(items, index, "bbbbbbbb-1") == "bbbbbbbb-1"
+        assert _find_id(items, index, "cccccccc") == "cccccccc-1"
+        assert _find_id(items, index, "ccc") == "cccccccc-1"
+        assert _find_id(items, index, "aaaaaaaa") == "aaaaaaaa-1"
+        assert _find_id(items, index, "aaaaaaaa-2") == "aaaaaaaa-2"
+        assert _find_id(items, index, "bbbbbbbb-2") is None
+        assert _find_id(items, index, "dddddddd") is None
+    
+    @pytest.mark.asyncio
+    async def test_memory_summary_counts(self):
+        """Test that summary counts follow adds, updates and resolutions."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="summary")
+        server.cmem_integration = False
+        
+        for n in range(3):
+            await server._task_add({"content": f"Task {n}"})
+        await server._task_update({"task_id": next(iter(server.tasks)), "status": "completed"})
+        await server._pattern_add({"pattern": "p", "description": "d"})
+        pattern_id = next(iter(server.patterns))
+        for _ in range(2):
+            await server._pattern_resolve({"pattern_id": pattern_id, "solution": "s"})
+        for key in ("a", "b", "a"):
+            await server._knowledge_add({"key": key, "value": "v"})
+        
+        text = (await server._memory_summary())["content"][0]["text"]
+        assert "Pending: 2" in text
+        assert "Completed: 1" in text
+        assert "Resolved: 1" in text
+        assert "Unresolved: 0" in text
+        assert "Total Knowledge Items: 2" in text
+    
+    @pytest.mark.asyncio
+    async def test_task_list_by_status(self):
+        """Test that filtered task lists follow status updates and reloads."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="by-status")
+        server.cmem_integration = False
+        
+        for n in range(3):
+            await server._task_add({"content": f"Task {n}"})
+        first = next(iter(server.tasks))
+        await server._task_update({"task_id": first, "status": "in_progress"})
+        
+        text = (await server._task_list({"status": "pending"}))["content"][0]["text"]
+        assert "Task 0" not in text
+        assert text.index("Task 1") < text.index("Task 2")
+        text = (await server._task_list({"status": "in_progress"}))["content"][0]["text"]
+        assert "[in_progress]" in text and "Task 0" in text
+        assert (await server._task_list({"status": "completed"}))["content"][0]["text"] == "No tasks found"
+        
+        await server.flush()
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            reloaded = MemoryServer(identity="by-status")
+        assert reloaded._tasks is None
+        assert len(reloaded.tasks) == 3
+        assert list(reloaded._tasks_by_status["pending"]) == list(server._tasks_by_status["pending"])
+        assert list(reloaded._tasks_by_status["in_progress"]) == [first]
+    
+    @pytest.mark.asyncio
+    async def test_task_list_by_status_keeps_creation_order(self):
+        """Test that filtered task lists stay in creation order across updates."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="status-order")
+        server.cmem_integration = False
+        
+        for name in ("A", "B", "C"):
+            await server._task_add({"content": name})
+        a_id, b_id, c_id = server.tasks
+        
+        async def listed(status=None):
+            args = {"status": status} if status else {}
+            text = (await server._task_list(args))["content"][0]["text"]
+            return [line.rsplit(" - ", 1)[1].split(" (")[0] for line in text.splitlines()[1:]]
+        
+        # Re-setting the current status changes nothing
+        await server._task_update({"task_id": a_id, "status": "pending"})
+        assert await listed("pending") == await listed() == ["A", "B", "C"]
+        
+        # Moving an older task into a status behind a newer one
+        await server._task_update({"task_id": c_id, "status": "in_progress"})
+        await server._task_update({"task_id": a_id, "status": "in_progress"})
+        assert await listed("in_progress") == ["A", "C"]
+        
+        await server.flush()
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="status-order")
+        assert await listed("in_progress") == ["A", "C"]
+        assert await listed("pending") == ["B"]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("how", ["stop", "sigterm"])
+    async def test_changes_saved_on_shutdown(self, how):
+        """Test that a change made just before the server process is stopped is written."""
+        import os
+        import signal
+        from mcp_browser.server import MCPServer
+        from mcp_browser.config import MCPServerConfig
+        
+        script = Path(__file__).parent.parent / "mcp_servers" / "memory" / "memory_server.py"
+        server = MCPServer(MCPServerConfig(
+            command=[sys.executable, str(script)],
+            env={"HOME": self.temp_dir, "PATH": os.defpath}
+        ))
+        await server.start()
+        try:
+            await server.send_request("initialize", {})
+            await server.send_request("tools/call", {"name": "task_add", "arguments": {"content": "Last"}})
+            if how == "sigterm":
+                server.process.send_signal(signal.SIGTERM)
+                await asyncio.wait_for(server.process.wait(), timeout=5)
+        finally:
+            await server.stop()
+        
+        with open(Path(self.temp_dir) / ".mcp-memory" / "default" / "tasks.log") as f:
+            entries = [json.loads(line) for line in f]
+        assert [entry["value"]["content"] for entry in entries] == ["Last"]
+    
+    @pytest.mark.asyncio
+    async def test_data_files_read_on_first_use(self):
+        """Test that a project's data files are read only by the tools using them."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="lazy")
+        server.cmem_integration = False
+        
+        await server._task_add({"content": "Before switch"})
+        await server._knowledge_add({"key": "k", "value": "v"})
+        await server._project_switch({"project": "other"})
+        assert server._tasks is None and server._knowledge is None
+        
+        await server._project_switch({"project": "lazy"})
+        text = (await server._knowledge_get({"key": "k"}))["content"][0]["text"]
+        assert "k: v" in text
+        assert server._tasks is None and server._decisions is None and server._patterns is None
+        assert "Pending: 1" in (await server._memory_summary())["content"][0]["text"]
+    
+    @pytest.mark.asyncio
+    async def test_tool_calls_dispatch_to_handlers(self):
+        """Test that tools/call requests reach the registered tool handlers."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="dispatch")
+        server.cmem_integration = False
+        
+        assert all(tool["handler"] for tool in server.tools.values())
+        response = await server.handle_request({
+            "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+            "params": {"name": "task_add", "arguments": {"content": "Routed"}}
+        })
+        assert "Added task" in response["result"]["content"][0]["text"]
+        assert len(server.tasks) == 1
+        
+        response = await server.handle_request({
+            "jsonrpc": "2.0", "id": 2, "method": "tools/call",
+            "params": {"name": "memory_summary", "arguments": {}}
+        })
+        assert "Pending: 1" in response["result"]["content"][0]["text"]
+    
+    @pytest.mark.asyncio
+    async def test_cmem_sync_runs_in_background(self):
+        """Test that tool calls return before their cmem syncs finish, in order."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="background")
+        server.cmem_integration = True
+        release = asyncio.Event()
+        synced = []
+        
+        async def slow_sync(item, action):
+            await release.wait()
+            synced.append(item.content)
+        
+        with patch.object(server, '_sync_task_to_cmem', slow_sync):
+            await server._task_add({"content": "one"})
+            await server._task_add({"content": "two"})
+            assert synced == []
+            
+            release.set()
+            await server._cmem_idle()
+        assert synced == ["one", "two"]
+    
+    @pytest.mark.asyncio
+    async def test_knowledge_get_by_key(self):
+        """Test that a key is found in every category holding it."""
+        with patch('pathlib.Path.home', return_value=Path(self.temp_dir)):
+            server = MemoryServer(identity="knowledge")
+        
+        await server._knowledge_add({"key": "k", "value": "one", "category": "a"})
+        await server._knowledge_add({"key": "other", "value": "x", "category": "b"})
+        await server._knowledge_add({"key": "k", "value": "two", "category": "b"})
+        await server._knowledge_add({"key": "k", "value": "three", "category": "b"})
+        
+        result = await server._knowledge_get({"key": "k"})
+        assert result["content"][0]["text"] == "[a] k: one\n[b] k: three"
+        result = await server._knowledge_get({"key": "missing"})
+        assert result["content"][0]["text"] == "No knowledge found"
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file